@@ -0,0 +1,62 @@
+"""
+Benchmark of stepping a built level, comparing the default bounding box tree
+broadphase of the space with a spatial hash sized to the block grid
+(see World.use_spatial_hash), across level sizes. Levels are built both with a shape
+for each block, and with plain blocks merged into shared shapes.
+
+Run from the root of the project:
+    python benchmarks/broadphase.py [steps] [columns ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from game.clock import SimulatedClock
+from level import load_world
+
+from level_loading import write_level
+from level_memory import create_builder
+
+# Steps taken before timing, to let mobs and items settle onto the terrain
+WARM_UP_STEPS = 50
+
+
+def measure(filename, compact, spatial_hash, steps):
+    """(tuple<float, int>) Returns the mean time of a step of a world built from a level
+    file, in seconds, and the number of shapes in its space.
+    """
+    builder = create_builder(compact, clock=SimulatedClock(), spatial_hash=spatial_hash)
+    world = load_world(builder, filename)
+    game_data = (world, None)
+
+    for _ in range(WARM_UP_STEPS):
+        world.step(game_data)
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        world.step(game_data)
+    return (time.perf_counter() - start) / steps, len(world.get_space().shapes)
+
+
+def main(steps=200, *columns):
+    with tempfile.TemporaryDirectory() as directory:
+        for width in columns or (250, 1000, 4000):
+            filename = os.path.join(directory, f'level{width}.txt')
+            write_level(filename, width)
+
+            for layout, compact in (('per-block', False), ('merged', True)):
+                print(f"Stepping a {width} column {layout} level {steps} times")
+                results = {}
+                for name, spatial_hash in (('bb-tree', False), ('spatial hash', True)):
+                    results[name], shapes = measure(filename, compact, spatial_hash, steps)
+                    print(f"  {name:<12} {results[name] * 1000:8.3f} ms/step  {shapes:6} shapes")
+
+                print(f"  speedup      {results['bb-tree'] / results['spatial hash']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
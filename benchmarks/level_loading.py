@@ -0,0 +1,87 @@
+"""
+Benchmark of parsing level files, comparing the single-pass parser used by
+level.parse_level with the original parser, which padded the whole level into a
+string before splitting it again.
+
+Run from the root of the project:
+    python benchmarks/level_loading.py [columns] [repeats]
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from level import parse_level
+
+# Rows of the synthetic level, from top to bottom
+LEVEL_ROWS = 15
+
+
+def legacy_parse_level(filename):
+    """Parse the entities within a level file, as level.parse_level used to."""
+    with open(filename, 'r') as file:
+        file_contents = file.readlines()
+
+    max_width = len(max(file_contents))
+
+    level = []
+    for line in file_contents:
+        fill = max_width - len(line)
+        level.append(line.rstrip() + (" " * fill))
+
+    entities = []
+    for y, line in enumerate("\n".join(level).split('\n')):
+        for x, character in enumerate(line):
+            if character in ('\n', ' '):
+                continue
+
+            entities.append((character, x, y))
+
+    return entities
+
+
+def write_level(filename, columns):
+    """Write a synthetic level with the given number of columns.
+
+    The level has a floor, with platforms, mystery blocks, coins and mobs scattered
+    above it at regular intervals.
+    """
+    rows = [[' '] * columns for _ in range(LEVEL_ROWS)]
+    for x in range(columns):
+        rows[-1][x] = rows[-2][x] = '#'
+        if x % 40 < 6:
+            rows[8][x] = '%'
+        if x % 40 == 3:
+            rows[4][x] = '?'
+        if x % 25 == 0:
+            rows[7][x] = 'C'
+        if x % 60 == 30:
+            rows[-3][x] = '@'
+
+    with open(filename, 'w') as file:
+        for row in rows:
+            file.write(''.join(row).rstrip() + '\n')
+
+
+def main(columns=100000, repeats=5):
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'level.txt')
+        write_level(filename, columns)
+
+        if parse_level(filename) != legacy_parse_level(filename):
+            raise AssertionError("parsers do not agree")
+
+        print(f"Parsing a {columns} column level, best of {repeats}")
+        results = {}
+        for name, parse in (('legacy', legacy_parse_level), ('single-pass', parse_level)):
+            results[name] = min(timeit.repeat(lambda: parse(filename), number=1, repeat=repeats))
+            print(f"  {name:<12} {results[name] * 1000:8.1f} ms")
+
+        print(f"  speedup      {results['legacy'] / results['single-pass']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
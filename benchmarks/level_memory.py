@@ -0,0 +1,112 @@
+"""
+Measurement of the memory used by a built level, comparing a world in which each
+plain block is its own Block with its own shape, with one in which plain blocks are
+merged and only kept as compact per-cell records until they are needed.
+
+Memory is measured with tracemalloc, so only allocations made by Python are counted;
+the memory chipmunk allocates for each shape is not included.
+
+Run from the root of the project:
+    python benchmarks/level_memory.py [columns]
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+from functools import partial
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from game.block import Block
+from game.item import DroppedItem
+from game.mob import Mob
+from game.world import World
+from level import WorldBuilder, load_compiled_level, load_world
+from session import (BLOCK_SIZE, BLOCKS, ITEMS, MOBS, BLOCK_FACTORIES, ITEM_FACTORIES,
+                     MOB_FACTORIES, create_unknown)
+
+from level_loading import LEVEL_ROWS, write_level
+
+
+def write_terrain(filename, columns):
+    """Write a synthetic level with the given number of columns, made only of plain blocks.
+
+    The level has a floor four blocks deep, with platforms at regular intervals.
+    """
+    rows = [[' '] * columns for _ in range(LEVEL_ROWS)]
+    for x in range(columns):
+        for y in range(LEVEL_ROWS - 4, LEVEL_ROWS):
+            rows[y][x] = '#' if y < LEVEL_ROWS - 2 else '%'
+        if x % 40 < 6:
+            rows[8][x] = '#'
+
+    with open(filename, 'w') as file:
+        for row in rows:
+            file.write(''.join(row).rstrip() + '\n')
+
+
+def create_builder(compact, **options):
+    """Returns a builder for the entities of the game.
+
+    Parameters:
+        compact (bool): If True, plain blocks are merged and kept as compact records,
+                        otherwise each is constructed as a Block with its own shape.
+        options: Other parameters of the builder (see WorldBuilder)
+    """
+    builder = WorldBuilder(BLOCK_SIZE, fallback=create_unknown, merge_blocks=compact, **options)
+    for entity_id, block_id in BLOCKS.items():
+        factory = BLOCK_FACTORIES.get(block_id)
+        if factory is None and compact:
+            builder.register_plain_block(entity_id, block_id)
+        else:
+            builder.register_factory(entity_id, factory or partial(Block, block_id), World.add_block)
+
+    for entity_id, item_id in ITEMS.items():
+        factory = ITEM_FACTORIES.get(item_id, partial(DroppedItem, item_id))
+        builder.register_factory(entity_id, factory, World.add_item)
+
+    for entity_id, mob_id in MOBS.items():
+        factory = MOB_FACTORIES.get(mob_id, partial(Mob, mob_id, size=(1, 1)))
+        builder.register_factory(entity_id, factory, World.add_mob)
+
+    return builder
+
+
+def measure(filename, compact):
+    """(tuple<int, int>) Returns the memory held by a world built from a level file,
+    and the number of shapes in its space.
+    """
+    builder = create_builder(compact)
+    gc.collect()
+
+    tracemalloc.start()
+    world = load_world(builder, filename)
+    builder.clear()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return size, len(world.get_space().shapes)
+
+
+def main(columns=20000):
+    with tempfile.TemporaryDirectory() as directory:
+        for description, write in (("terrain", write_terrain), ("mixed", write_level)):
+            filename = os.path.join(directory, description + '.txt')
+            write(filename, columns)
+            # parse (and cache) the level up front, so that only building the world is measured
+            entities = len(load_compiled_level(filename))
+
+            print(f"Building a {columns} column {description} level of {entities} entities")
+            results = {}
+            for name, compact in (('per-block', False), ('compact', True)):
+                results[name], shapes = measure(filename, compact)
+                print(f"  {name:<10} {results[name] / 2 ** 20:8.2f} MiB  {shapes:7} shapes")
+
+            print(f"  reduction  {results['per-block'] / results['compact']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -13,4 +13,4 @@ using the tkinter library.
 __version__ = "1.1.0"
 __copyright__ = "The University of Queensland, 2019"
 
-__all__ = ["block", "item", "entity", "mob", "util", "view", "world"]
+__all__ = ["block", "clock", "item", "entity", "mob", "util", "view", "world"]
@@ -3,15 +3,17 @@ Classes to represent static block entities in the game world.
 """
 
 import random
-from typing import Tuple
+from typing import Tuple, List, Union, Iterator
 
 from game.entity import Entity
 from game.item import Coin
-from game.util import get_collision_direction
+from game.util import get_arbiter_direction
 
 
 class Block(Entity):
     """One of the blocks in the sandbox game"""
+    __slots__ = ('_block_id',)
+
     # The unique identifier for this block
     _id = None
     _type = 2
@@ -21,16 +23,14 @@ class Block(Entity):
         """Construct a generic block with a block identifier.
 
         Parameters:
-            block_id (str): The unique id of this block
+            block_id (str): The unique id of this block, defaults to the id of its class
         """
         super().__init__()
-
-        if block_id is not None:
-            self._id = block_id
+        self._block_id = block_id
 
     def get_id(self) -> str:
         """(str) Returns the unique id of this block"""
-        return self._id
+        return self._id if self._block_id is None else self._block_id
 
     def get_position(self) -> Tuple[float, float]:
         """(float, float) Returns the (x, y) position of the block's centre"""
@@ -45,7 +45,87 @@ class Block(Entity):
         return self._cell_size
 
     def __repr__(self):
-        return f"{self.__class__.__name__}({self._id})"
+        return f"{self.__class__.__name__}({self.get_id()})"
+
+
+# Subclasses of Block for the ids of plain blocks (see plain_block_type)
+_plain_block_types = {}
+
+
+def plain_block_type(block_id: str) -> type:
+    """(type) Returns the subclass of Block whose instances all have the given block id
+
+    The id is shared through the class rather than stored by each instance, so large numbers
+    of identical blocks (e.g. bricks) are cheaper to construct and store than Block(block_id).
+    """
+    block_type = _plain_block_types.get(block_id)
+    if block_type is None:
+        block_type = type(Block.__name__, (Block,), {'_id': block_id, '__slots__': ()})
+        block_type = _plain_block_types.setdefault(block_id, block_type)
+    return block_type
+
+
+class BlockGroup(Entity):
+    """A rectangle of adjacent plain blocks which share a single physical shape.
+
+    Each cell of the group holds either a block, or, for a block which has not been
+    needed on its own yet, just its type (see plain_block_type). Only the shape of the
+    group is added to the game world; the world creates the block of a cell, with its
+    own shape describing its position, when the cell is first needed (see World.get_block).
+    """
+    __slots__ = ('_cells', '_rectangle')
+
+    _type = 2
+
+    def __init__(self, cells: List[Union[Block, type]], rectangle: Tuple[int, int, int, int]):
+        """Construct a group of blocks.
+
+        Parameters:
+            cells (list<Block | type>): The block or block type of each grid cell covered
+                                        by the group, column by column.
+            rectangle (tuple<int, int, int, int>): The (column, row, width, height) of
+                                                   the grid cells covered by the group.
+        """
+        super().__init__()
+        self._cells = cells
+        self._rectangle = rectangle
+
+    def get_rectangle(self) -> Tuple[int, int, int, int]:
+        """(tuple<int, int, int, int>) Returns the (column, row, width, height) of the group"""
+        return self._rectangle
+
+    def _get_index(self, column: int, row: int) -> int:
+        """(int) Returns the index of the cell in the group nearest to ('column', 'row')"""
+        left, top, width, height = self._rectangle
+        column = min(max(column, left), left + width - 1)
+        row = min(max(row, top), top + height - 1)
+        return (column - left) * height + row - top
+
+    def get_cell(self, column: int, row: int) -> Union[Block, type]:
+        """(Block | type) Returns the block, or block type, of the cell in the group
+        nearest to the grid cell ('column', 'row')
+        """
+        return self._cells[self._get_index(column, row)]
+
+    def set_cell(self, column: int, row: int, block: Block):
+        """Sets the block of the grid cell ('column', 'row') within the group"""
+        self._cells[self._get_index(column, row)] = block
+
+    def get_cells(self) -> Iterator[Tuple[int, int, Union[Block, type]]]:
+        """Yields the (column, row, block or block type) of each cell in the group"""
+        left, top, width, height = self._rectangle
+        cells = iter(self._cells)
+        for column in range(left, left + width):
+            for row in range(top, top + height):
+                yield column, row, next(cells)
+
+    def get_block_ids(self) -> Iterator[Tuple[int, int, str]]:
+        """Yields the (column, row, block id) of each cell in the group"""
+        for column, row, cell in self.get_cells():
+            yield column, row, cell._id if isinstance(cell, type) else cell.get_id()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._rectangle})"
 
 
 class MysteryBlock(Block):
@@ -70,13 +150,16 @@ class MysteryBlock(Block):
         self._drop_range = drop_range
         self._active = True
 
-    def get_drops(self) -> Tuple[str, ...]:
+    def get_drops(self, rng=random) -> Tuple[str, ...]:
         """Get the drops of the mystery block
 
+        Parameters:
+            rng (random.Random): The random number generator used to pick the number of drops.
+
         Returns:
             tuple<str, ...>: The item identifiers of the dropped items.
         """
-        return (self._drop,) * random.randint(*self._drop_range)
+        return (self._drop,) * rng.randint(*self._drop_range)
 
     def _drop_items(self, world, drops: Tuple[str]):
         """Drop each of the dropped items into the world.
@@ -86,24 +169,26 @@ class MysteryBlock(Block):
             drops (tuple<str>): A tuple of item identifiers to place.
         """
         x, y = self.get_position()
+        rng = world.get_random()
         for drop in drops:
             if drop is not None:
                 # world.add_item(create_item(drop), TODO: Make this non-hardcoded
-                world.add_item(Coin(), x + random.randint(-10, 10), y - 25)
+                world.spawn_item(Coin, x + rng.randint(-10, 10), y - 25)
 
     def on_hit(self, event, data):
         """Callback collision with player event handler."""
         world, player = data
         # Ensure the bottom of the block is being hit
-        if get_collision_direction(player, self) != "B":
+        if get_arbiter_direction(event, player, self) != "B":
             return
 
         if self._active:
             self._active = False
+            world.mark_changed(self)
 
             # Drop items into the game world
-            drops = self.get_drops()
-            self._drop_items(data[0], drops)
+            drops = self.get_drops(world.get_random())
+            self._drop_items(world, drops)
             
 
     def is_active(self) -> bool:
@@ -0,0 +1,60 @@
+"""
+Clocks which provide the current time to the game world
+"""
+
+import time
+
+
+class Clock:
+    """A source of the current time, in seconds
+
+    Should not be instantiated directly.
+    """
+
+    def time(self) -> float:
+        """(float) Returns the current time, in seconds"""
+        raise NotImplementedError("Should be overridden in a subclass")
+
+    def advance(self, time_delta: float):
+        """Advances the clock by one time-step of the game world
+
+        Parameters:
+            time_delta (float): The time (in seconds) stepped through by the world
+        """
+        pass
+
+
+class RealClock(Clock):
+    """A clock which follows the wall-clock time of the system"""
+
+    def time(self) -> float:
+        """(float) Returns the current system time, in seconds"""
+        return time.time()
+
+
+class SimulatedClock(Clock):
+    """A clock which only advances as the game world is stepped
+
+    Games using a simulated clock are deterministic, and can be run faster (or slower)
+    than real time.
+    """
+
+    def __init__(self, start: float = 0):
+        """Construct a simulated clock
+
+        Parameters:
+            start (float): The initial time of the clock, in seconds
+        """
+        self._time = start
+
+    def time(self) -> float:
+        """(float) Returns the time simulated so far, in seconds"""
+        return self._time
+
+    def advance(self, time_delta: float):
+        """Advances the clock by one time-step of the game world
+
+        Parameters:
+            time_delta (float): The time (in seconds) stepped through by the world
+        """
+        self._time += time_delta
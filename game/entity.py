@@ -3,7 +3,6 @@ High-level abstract classes to represent entities in the game world
 """
 
 import pymunk
-import time
 
 from typing import Tuple
 
@@ -14,7 +13,11 @@ class Entity:
     Should not be instantiated directly.
     """
 
+    __slots__ = ('_shape',)
+
     _type = 0
+    # whether the body of this type of entity may fall asleep when idle (see World.step)
+    _can_sleep = True
 
     def __init__(self):
         self._shape: pymunk.Shape = None
@@ -28,6 +31,13 @@ class Entity:
         """
         return 2 ** cls._type
 
+    @classmethod
+    def can_sleep(cls) -> bool:
+        """(bool) Returns True iff the body of the entity may fall asleep when idle, after
+        which the entity is no longer stepped until its body is woken
+        """
+        return cls._can_sleep
+
     def resolve_shape(self, shape: pymunk.Shape, friction: float = 1.):
         """Resolve the shape of a method by setting appropriate entity groups
 
@@ -84,12 +94,19 @@ class DynamicEntity(Entity):
     Should not be instantiated directly.
     """
 
+    __slots__ = ('_health', '_max_health', '_jumping')
+
     def __init__(self, max_health=20):
         super().__init__()
 
         self._health = self._max_health = max_health
         self._jumping = False
 
+    def reset(self):
+        """Restores this dynamic thing to full health, ready to be reused (see World.spawn_mob)"""
+        self._health = self._max_health
+        self._jumping = False
+
     def change_health(self, change):
         """Increases the dynamic thing's health by 'change (float)'"""
         self._health += change
@@ -2,12 +2,9 @@
 Classes to represent non-playable computer-controlled moving entity.
 """
 
-import random
 import pymunk
-import time
 
 from game.entity import DynamicEntity
-from game.util import get_collision_direction
 from game.item import Coin
 
 MOB_DEFAULT_TEMPO = 30
@@ -45,8 +42,6 @@ class Mob(DynamicEntity):
         self._weight = weight
         self._tempo = tempo
 
-        self._steps = 0
-
     def get_id(self):
         """(str) Returns the unique id for this type of mob"""
         return self._id
@@ -79,11 +74,10 @@ class Mob(DynamicEntity):
 
     def step(self, time_delta, game_data):
         """Advance this mob by one time step"""
-        # Track time via time_delta would be more precise, but a step counter is simpler
-        # and works reasonably well, assuming time steps occur at roughly constant time deltas
-        self._steps += 1
-        vx = self.get_tempo()
-        self.set_velocity((vx, self.get_velocity()[1]))
+        vx, vy = self.get_velocity()
+        # setting the velocity wakes the body, so it is only set when it changes
+        if vx != self.get_tempo():
+            self.set_velocity((self.get_tempo(), vy))
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self._id!r})"
@@ -110,7 +104,11 @@ class CloudMob(Mob):
     will fire a fireball at them.
     """
     _id = "cloud"
+    # the cloud follows the player, so must be stepped even while hovering in place
+    _can_sleep = False
     MAX_DISTANCE = 20
+    # The time (in seconds) the cloud waits before firing, and between each shot
+    FIRE_DELAY = 2
 
     def __init__(self, fire_range=10):
         """Construct a new cloud mob.
@@ -120,14 +118,23 @@ class CloudMob(Mob):
                               the cloud will start firing.
         """
         super().__init__(self._id, size=(16, 24), weight=0, tempo=80)
-        self._last_drop = time.time()
+        # whether the cloud's fire delay has elapsed, or None if the cloud has not been stepped
+        self._ready = None
         self._fire_range = fire_range
 
+    def _reload(self):
+        """Allow the cloud to fire again, once its fire delay has elapsed."""
+        self._ready = True
+
     def step(self, time_delta, game_data):
         """Move towards the player and fire when within range."""
         world, player = game_data
         vx, vy = self.get_velocity()
 
+        if self._ready is None:
+            self._ready = False
+            world.schedule(self.FIRE_DELAY, self._reload)
+
         mob_x, mob_y = self.get_position()
         player_x, player_y = player.get_position()
 
@@ -135,18 +142,17 @@ class CloudMob(Mob):
         if abs(player_x - mob_x) < self._fire_range:
             vx = 0
             # only fire after a delay
-            if time.time() - self._last_drop >= 2:
+            if self._ready:
                 x, y = self.get_position()
 
-                rand_val = random.randint(1, 10)
+                rand_val = world.get_random().randint(1, 10)
                 # occasionally drop a coin instead
                 if rand_val == 1:
-                    drop = Coin()
-                    world.add_item(drop, x, y + 22)
+                    world.spawn_item(Coin, x, y + 22)
                 else:
-                    drop = Fireball()
-                    world.add_mob(drop, x, y + 22)
-                self._last_drop = time.time()
+                    world.spawn_mob(Fireball, x, y + 22)
+                self._ready = False
+                world.schedule(self.FIRE_DELAY, self._reload)
 
         # move towards the player
         elif player_x < mob_x:
@@ -2,6 +2,10 @@
 Some utility & miscellany for the game engine
 """
 
+from typing import Iterable, List, Tuple
+
+import pymunk
+
 from game.entity import DynamicEntity, Entity
 
 ABOVE = "A"
@@ -49,6 +53,68 @@ def get_collision_direction(entity: DynamicEntity, other: Entity):
             return result
 
 
+# The direction of 'other' from 'entity' for each direction of a collision
+OPPOSITE_DIRECTIONS = {
+    ABOVE: BELOW,
+    BELOW: ABOVE,
+    LEFT: RIGHT,
+    RIGHT: LEFT,
+    None: None
+}
+
+
+def _get_normal_direction(nx: float, ny: float) -> str:
+    """(str) Returns the direction of a collision with a normal pointing from the
+    colliding entity towards the entity it collided with
+    """
+    if abs(ny) >= abs(nx):
+        # y increases downwards, so the other entity is below if ny is positive
+        return ABOVE if ny > 0 else BELOW
+    return LEFT if nx > 0 else RIGHT
+
+
+def get_arbiter_direction(arbiter: pymunk.Arbiter, entity: DynamicEntity, other: Entity):
+    """Get the direction where from which a collision event occurred, from the contact
+    normal of the collision.
+
+    The direction is memoized on the arbiter, so repeated calls for the same collision
+    (in either order) are free. If the arbiter has no contact points, or neither shape
+    of the arbiter belongs to the entities, get_collision_direction is used instead.
+
+    Parameters:
+        arbiter (pymunk.Arbiter): The arbiter of the collision event.
+        entity (DynamicEntity): Colliding entity.
+        other (Entity): The entity with which the colliding entity collided.
+
+    Returns:
+        (str): The direction the collision occurred in, as per get_collision_direction.
+    """
+    directions = getattr(arbiter, "_directions", None)
+    if directions is None:
+        directions = arbiter._directions = {}
+    elif (entity, other) in directions:
+        return directions[entity, other]
+
+    direction = None
+    contacts = arbiter.contact_point_set
+    shape_a, shape_b = arbiter.shapes
+
+    if contacts.points:
+        # the normal points from the first shape of the arbiter to the second
+        nx, ny = contacts.normal
+        if shape_a is entity.get_shape() or shape_b is other.get_shape():
+            direction = _get_normal_direction(nx, ny)
+        elif shape_b is entity.get_shape() or shape_a is other.get_shape():
+            direction = _get_normal_direction(-nx, -ny)
+
+    if direction is None:
+        direction = get_collision_direction(entity, other)
+
+    directions[entity, other] = direction
+    directions[other, entity] = OPPOSITE_DIRECTIONS[direction]
+    return direction
+
+
 def euclidean_square_distance(position1: (float, float), position2: (float, float)):
     """(tuple<float, float>) Returns the euclidean (straight-line) distance between 'position1' & 'position2'
 
@@ -72,3 +138,49 @@ def positions_in_range(position1, position2, max_distance):
         max_distance (float): The maximum distance between position1 & position2
     """
     return euclidean_square_distance(position1, position2) <= max_distance ** 2
+
+
+def merge_cells(cells: Iterable[Tuple[int, int]]) -> List[Tuple[int, int, int, int]]:
+    """(list<tuple<int, int, int, int>>) Greedily covers grid cells with rectangles
+
+    Each row is split into runs of adjacent cells, and a run is merged into the rectangle
+    directly above it when both span exactly the same columns.
+
+    Parameters:
+        cells (iterable<tuple<int, int>>): The (column, row) grid cells to cover
+
+    Returns:
+        The (column, row, width, height) of each rectangle, which together cover
+        each of the cells exactly once
+    """
+    rows = {}
+    for column, row in cells:
+        rows.setdefault(row, []).append(column)
+
+    rectangles = []
+    # rectangles which may be extended by the next row, by their (first, last) columns
+    extendable = {}
+    for row in sorted(rows):
+        columns = sorted(rows[row])
+
+        runs = []
+        start = previous = columns[0]
+        for column in columns[1:]:
+            if column != previous + 1:
+                runs.append((start, previous))
+                start = column
+            previous = column
+        runs.append((start, previous))
+
+        extended = {}
+        for first, last in runs:
+            rectangle = extendable.get((first, last))
+            if rectangle is not None and rectangle[1] + rectangle[3] == row:
+                rectangle[3] += 1
+            else:
+                rectangle = [first, row, last - first + 1, 1]
+                rectangles.append(rectangle)
+            extended[first, last] = rectangle
+        extendable = extended
+
+    return [tuple(rectangle) for rectangle in rectangles]
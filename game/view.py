@@ -3,13 +3,13 @@ View classes for the sandbox game
 """
 
 import tkinter as tk
-from typing import Iterable, Tuple, List
+from typing import Iterable, Tuple, List, Dict, Callable
 from functools import singledispatch, update_wrapper
 
 import pymunk
 
 from game.entity import Entity
-from game.block import Block
+from game.block import Block, BlockGroup
 from game.item import DroppedItem
 from game.mob import Mob
 
@@ -29,6 +29,7 @@ def singledispatchmethod(func):
         return dispatcher.dispatch(args[1].__class__)(*args, **kw)
 
     wrapper.register = dispatcher.register
+    wrapper.dispatch = dispatcher.dispatch
     update_wrapper(wrapper, func)
     return wrapper
 
@@ -50,6 +51,14 @@ class ViewRenderer:
     To implement a new view method, add a decorator to the draw method of the form:
         @ViewRenderer.draw.register(Type)
     Where Type would be the class of the entity you wish to render.
+
+    The redraw method is used by a retained GameView to update the canvas elements
+    previously created by draw, rather than recreating them. It takes the same
+    parameters as draw, followed by the list of canvas item ids to update, and is
+    dispatched the same way:
+        @ViewRenderer.redraw.register(Type)
+    Types with a specialised redraw method are considered to have an appearance that
+    can change without moving, and are redrawn every frame.
     """
 
     def __init__(self, block_images, item_images, mob_images):
@@ -64,6 +73,7 @@ class ViewRenderer:
         super().__init__()
 
         self._images = {}
+        self._stateful = {}
 
         self._block_images = block_images
         self._item_images = item_images
@@ -105,32 +115,87 @@ class ViewRenderer:
                                       shape.bb.right + offset[0], shape.bb.bottom,
                                       fill='black', tag='undefined')]
 
+    @singledispatchmethod
+    def redraw(self, instance: Entity, shape: pymunk.Shape, view: tk.Canvas,
+               offset: Tuple[int, int], items: List[int]) -> List[int]:
+        """Method to update the existing canvas elements for the given entity.
+
+        By default, each canvas element is moved to the centre of the entity's shape.
+
+        Parameters:
+            instance (Entity): The entity to redraw
+            shape (pymunk.Shape): The entities shape in the world
+            view (tk.Canvas): The canvas on which the entity has been drawn
+            offset (tuple<int, int>): The offset of the logical view from the canvas.
+            items (list<int>): The canvas elements returned when the entity was drawn.
+
+        Returns:
+            (list<int>): The canvas elements now representing the entity.
+        """
+        x, y = shape.bb.center()
+        for item in items:
+            view.coords(item, x + offset[0], y + offset[1])
+        return items
+
+    def is_stateful(self, instance: Entity) -> bool:
+        """(bool) Returns True iff a specialised redraw method has been registered
+        for the type of the given entity, i.e. its appearance depends on its state.
+        """
+        cls = instance.__class__
+        if cls not in self._stateful:
+            self._stateful[cls] = (ViewRenderer.redraw.dispatch(cls)
+                                   is not ViewRenderer.redraw.dispatch(object))
+        return self._stateful[cls]
+
     @draw.register(Block)
     def _draw_block(self, instance: Block, shape: pymunk.Shape,
                     view: tk.Canvas, offset: Tuple[int, int]) -> List[int]:
         image = self.load_image(self._block_images[instance.get_id()])
-        return [view.create_image(shape.bb.center().x + offset[0], shape.bb.center().y,
+        return [view.create_image(shape.bb.center().x + offset[0], shape.bb.center().y + offset[1],
                                   image=image, tags="block")]
 
+    @draw.register(BlockGroup)
+    def _draw_block_group(self, instance: BlockGroup, shape: pymunk.Shape,
+                          view: tk.Canvas, offset: Tuple[int, int]) -> List[int]:
+        column, row, width, height = instance.get_rectangle()
+        cell_width = (shape.bb.right - shape.bb.left) / width
+        cell_height = (shape.bb.top - shape.bb.bottom) / height
+
+        items = []
+        for cell_column, cell_row, block_id in instance.get_block_ids():
+            image = self.load_image(self._block_images[block_id])
+            x = shape.bb.left + (cell_column - column + .5) * cell_width
+            y = shape.bb.bottom + (cell_row - row + .5) * cell_height
+            items.append(view.create_image(x + offset[0], y + offset[1],
+                                           image=image, tags="block"))
+        return items
+
+    @redraw.register(BlockGroup)
+    def _redraw_block_group(self, instance: BlockGroup, shape: pymunk.Shape, view: tk.Canvas,
+                            offset: Tuple[int, int], items: List[int]) -> List[int]:
+        view.delete(*items)
+        return self._draw_block_group(instance, shape, view, offset)
+
     @draw.register(DroppedItem)
     def _draw_physical_item(self, instance: DroppedItem, shape: pymunk.Shape,
                             view: tk.Canvas, offset: Tuple[int, int]) -> List[int]:
         image = self.load_image(self._item_images[instance.get_id()])
-        return [view.create_image(shape.bb.center().x + offset[0], shape.bb.center().y,
+        return [view.create_image(shape.bb.center().x + offset[0], shape.bb.center().y + offset[1],
                                   image=image, tags="item")]
 
     @draw.register(Mob)
     def _draw_mob(self, instance: Mob, shape: pymunk.Shape,
                         view: tk.Canvas, offset: Tuple[int, int]) -> List[int]:
         image = self.load_image(self._mob_images[instance.get_id()])
-        return [view.create_image(shape.bb.center().x + offset[0], shape.bb.center().y,
+        return [view.create_image(shape.bb.center().x + offset[0], shape.bb.center().y + offset[1],
                                   image=image, tags="mob")]
 
 
 class GameView(tk.Canvas):
     """A view class for the sandbox game, with convenience methods to draw various parts of the UI"""
 
-    def __init__(self, master, size, physical_view_router: ViewRenderer):
+    def __init__(self, master, size, physical_view_router: ViewRenderer,
+                 retained: bool = False):
         """Constructor
 
         Parameters:
@@ -140,37 +205,152 @@ class GameView(tk.Canvas):
                     View router that facilitates drawing of physical items through
                     calling draw method with:
                         (entity, entities shape, self (canvas), offset)
+            retained (bool): If True, canvas elements are kept between calls to
+                             draw_entities and updated in place, otherwise the caller
+                             is expected to clear the canvas before drawing.
         """
         width, height = size
-        super().__init__(master, width=width, height=height, bg="#6080ff")
+        # in retained mode the canvas is scrolled a pixel at a time (see set_offset)
+        super().__init__(master, width=width, height=height, bg="#6080ff",
+                         xscrollincrement=1 if retained else 0)
 
         self._world_view_router = physical_view_router
         self._offset = (0, 0)
 
+        self._retained = retained
+        # Pixels the canvas has been scrolled right by, in retained mode
+        self._scroll = 0
+        # Maps each drawn entity to its [canvas item ids, drawn (x, y) position]
+        self._drawn = {}
+        # Maps each block in the static layer to its canvas item ids
+        self._static = {}
+
     def shift(self, offset: Tuple[int, int]):
         """Shift the view offset by the given offset.
 
         Parameters:
             offset (tuple<int, int>): X and Y pixel offsets of the view.
         """
-        self._offset = (self._offset[0] + offset[0],
-                        self._offset[1] + offset[1])
+        self.set_offset((self._offset[0] + offset[0],
+                         self._offset[1] + offset[1]))
 
     def set_offset(self, offset: Tuple[int, int]):
-        """Sets the offset of the logical view to the given offset pari."""
+        """Sets the offset of the logical view to the given offset pari.
+
+        In retained mode, the canvas is scrolled to the horizontal offset, rather than
+        moving its elements, so the cost of scrolling does not depend on how much is drawn.
+        """
+        if self._retained:
+            scroll = round(-offset[0])
+            if scroll != self._scroll:
+                self.xview_scroll(scroll - self._scroll, tk.UNITS)
+                self._scroll = scroll
         self._offset = offset
 
     def get_offset(self) -> Tuple[int, int]:
         """(tuple<int, int>): Return the X and Y pixel offsets of the view."""
         return self._offset
 
-    def draw_entities(self, things: Iterable[Entity]):
+    def _get_canvas_offset(self) -> Tuple[int, int]:
+        """(tuple<int, int>) Returns the offset at which entities are drawn onto the canvas,
+        which excludes the horizontal offset in retained mode, as the canvas is scrolled instead
+        """
+        if self._retained:
+            return 0, self._offset[1]
+        return self._offset
+
+    def draw_entities(self, things: Iterable[Entity],
+                      displacement: Callable[[Entity], Tuple[float, float]] = None):
         """Draws all entities, according to their draw method (on the view renderer)
 
+        In retained mode, entities drawn previously are only redrawn if they have moved
+        or are stateful (see ViewRenderer.is_stateful), and the canvas elements of
+        previously drawn entities which are no longer present are deleted.
+
         Parameters:
             things (iterable<Entity>): The entities to draw.
+            displacement (Callable<Entity> -> tuple<float, float>):
+                    Returns the (x, y) displacement of an entity from its physical
+                    position at which to draw it, such as for interpolation
+                    (see World.get_render_displacement). Only used in retained mode.
         """
+        if not self._retained:
+            for thing in things:
+                shape = thing.get_shape()
+
+                self._world_view_router.draw(thing, shape, self, self._offset)
+            return
+
+        router = self._world_view_router
+        drawn = self._drawn
+        present = set()
+        canvas_offset = self._get_canvas_offset()
+
         for thing in things:
             shape = thing.get_shape()
+            x, y = shape.bb.center()
+            offset = canvas_offset
+            present.add(thing)
+
+            if displacement is not None:
+                dx, dy = displacement(thing)
+                x, y = x + dx, y + dy
+                offset = (offset[0] + dx, offset[1] + dy)
+
+            record = drawn.get(thing)
+            if record is None:
+                drawn[thing] = [router.draw(thing, shape, self, offset), (x, y)]
+            elif record[1] != (x, y) or router.is_stateful(thing):
+                record[0] = router.redraw(thing, shape, self, offset, record[0])
+                record[1] = (x, y)
+
+        for thing in drawn.keys() - present:
+            self.delete(*drawn.pop(thing)[0])
+
+    def draw_static(self, blocks: Iterable[Block]):
+        """Draws blocks which do not move into the static layer, replacing the blocks
+        previously drawn there.
 
-            self._world_view_router.draw(thing, shape, self, self._offset)
+        Canvas elements in the static layer are tagged 'static', are drawn below all
+        other entities and are never moved.
+
+        Parameters:
+            blocks (iterable<Block>): The blocks to draw.
+        """
+        self.delete('static')
+        self._static.clear()
+
+        self.update_static({block: True for block in blocks})
+
+    def update_static(self, changes: Dict[Block, bool]):
+        """Updates the blocks in the static layer which have been added, removed or changed.
+
+        Parameters:
+            changes (dict<Block: bool>): Mapping of each changed block to whether
+                                         it is present in the world.
+        """
+        if not changes:
+            return
+
+        router = self._world_view_router
+        offset = self._get_canvas_offset()
+        for block, present in changes.items():
+            items = self._static.pop(block, None)
+
+            if not present:
+                if items:
+                    self.delete(*items)
+                continue
+
+            shape = block.get_shape()
+            if items:
+                # redrawing may replace the items, e.g. for groups of merged blocks
+                items = router.redraw(block, shape, self, offset, items)
+            else:
+                items = router.draw(block, shape, self, offset)
+
+            for item in items:
+                self.addtag_withtag('static', item)
+            self._static[block] = items
+
+        self.tag_lower('static')
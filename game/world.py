@@ -2,15 +2,21 @@
 A class to represent a world made up of physical things
 """
 
+import functools
+import heapq
+import itertools
+import math
+import random
 import pymunk
-import time
-from typing import Tuple, Iterable
+from typing import Callable, Tuple, Iterable, List, Dict, Union
 
+from game.clock import Clock, RealClock
 from game.entity import BoundaryWall, Entity
 from player import Player
 from game.item import DroppedItem
-from game.block import Block
+from game.block import Block, BlockGroup
 from game.mob import Mob
+from game.util import merge_cells
 
 # The intention with the following constants is to express a finite range of values that
 # can effectively be treated as their own type in this code. We have used collections of
@@ -45,6 +51,40 @@ COLLISION_HANDLER_CALLBACKS = {'begin', 'separate', 'pre_solve', 'post_solve'}
 # The size of a time delta between steps
 STEP_SIZE = 0.02
 
+# The maximum number of steps taken by a single update, beyond which time is dropped
+MAX_CATCH_UP_STEPS = 5
+
+# The speed (in pixels per second) below which a body is considered idle
+IDLE_SPEED_THRESHOLD = 2.5
+
+# The time (in seconds) a body must be idle for before it falls asleep (see World.step)
+SLEEP_TIME_THRESHOLD = 0.5
+
+# The maximum number of removed things of each type kept for reuse (see World.spawn_mob)
+POOL_SIZE = 32
+
+
+class WorldSnapshot:
+    """The state of a world at a point in time, which it can be restored to (see World.snapshot)
+
+    Should only be constructed by World.
+    """
+
+    def __init__(self, shapes, bodies, things, block_grid):
+        """Constructor
+
+        Parameters:
+            shapes (set<pymunk.Shape>): The shapes in the world's space
+            bodies (dict<pymunk.Body: tuple>): The bodies in the world's space, mapped to
+                their (position, velocity, angle, angular velocity)
+            things (dict<Entity: dict>): The attributes of each thing in the world
+            block_grid (list<Block | BlockGroup>): A copy of the world's block index
+        """
+        self.shapes = shapes
+        self.bodies = bodies
+        self.things = things
+        self.block_grid = block_grid
+
 
 class World:
     """Game world that contains things in physical space.
@@ -64,7 +104,8 @@ class World:
     """
 
     def __init__(self, grid_size, cell_expanse, gravity=(0, 300), boundary_thickness=50,
-                 collision_types=None, thing_categories=None):
+                 collision_types=None, thing_categories=None, active_radius=None,
+                 clock: Clock = None, rng=None, sleep_time: float = SLEEP_TIME_THRESHOLD):
         """Creates a new world with four boundary walls
 
         Parameters:
@@ -78,6 +119,15 @@ class World:
             thing_categories (dict<str: int>):
                     Mapping of thing categories to unique powers of 2
                     Defaults to PHYSZICAL_THING_CATEGORIES constant
+            active_radius (float):
+                    The distance from the focus of a step beyond which things are not
+                    stepped, or None to step all things (see step)
+            clock (Clock): The source of time for things in the world, which is advanced
+                           with each step. Defaults to a RealClock
+            rng (random.Random): The random number generator used by things in the world
+                                 Defaults to the random module
+            sleep_time (float): The time (in seconds) a body must be idle for before it falls
+                                asleep, or None to keep all bodies awake
 
         """
         if collision_types is None:
@@ -92,19 +142,107 @@ class World:
 
         self._space.gravity = gravity
 
+        # Idle bodies fall asleep, and are not simulated until they are woken by a collision
+        # or by a change to their motion
+        if sleep_time is not None:
+            self._space.idle_speed_threshold = IDLE_SPEED_THRESHOLD
+            self._space.sleep_time_threshold = sleep_time
+
         self._grid_size = grid_size
         self._cell_expanse = cell_expanse
 
         self._pixel_size = tuple(grid * cell_expanse for grid in grid_size)
 
+        # Registries of the things in the space, each an ordered set (with None values):
+        #   - steppable: things which override Entity.step (see step), mapped to the order
+        #     in which they were registered rather than None
+        #   - static steppable: the static things among the steppable things
+        #   - dynamic: things with a body of their own, i.e. the player, items and mobs
+        #   - static: blocks, and groups of merged blocks
+        # Boundary walls are kept separately, and never change
+        self._steppable = {}
+        self._static_steppable = {}
+        self._dynamic = {}
+        self._static = {}
+        self._walls = []
+        self._register_sequence = itertools.count()
+        # Selects the dynamic things within the active radius of a step
+        self._active_filter = pymunk.ShapeFilter(
+            mask=pymunk.ShapeFilter.ALL_MASKS ^ (thing_categories["wall"] | thing_categories["block"]))
+
         self._create_boundaries(boundary_thickness)
 
-        self._last_time = time.time()
+        self._active_radius = active_radius
+
+        if clock is None:
+            clock = RealClock()
+        self._clock = clock
+
+        if rng is None:
+            rng = random
+        self._rng = rng
+
+        # Dense index of the block, or group of merged blocks, occupying each grid cell,
+        # or None for empty cells
+        # Stored column by column, such that the cells of a range of columns are contiguous
+        self._block_grid = [None] * (grid_size[0] * grid_size[1])
+
+        # Maps each block or group of blocks added, removed or changed since the last
+        # call to pop_block_changes to whether it is present in the world
+        self._block_changes = {}
+
+        # Time which has elapsed but is yet to be stepped through, in seconds
+        self._accumulator = 0
+        # Position of each body before the most recent step, used for interpolation
+        self._previous_positions = {}
+
+        # Whether the physics space is being stepped, during which additions and removals
+        # are queued, to be applied in one batch once the step is complete
+        self._stepping = False
+        # pymunk objects added, and shapes removed, during the current physics step
+        # Removals are keyed by shape, such that each shape is removed at most once
+        self._pending_additions = []
+        self._pending_removals = {}
+
+        # Heap of the [due time, sequence number, callback] of each scheduled callback,
+        # ordered by due time then by order of scheduling
+        # Cancelled callbacks are replaced by None, and left in the heap until due
+        self._scheduled = []
+        self._schedule_sequence = itertools.count()
+
+        # Maps each pair of collision types to tables of callbacks by collision event,
+        # which map the id of the first thing to the id of the second thing to the
+        # (callback, data) to call (see add_collision_dispatch)
+        self._dispatch_tables = {}
+        # Maps thing categories to the categories they can collide with (see ignore_collisions)
+        self._collision_masks = {}
+
+        # Things added by spawn_mob or spawn_item, which are kept for reuse once removed
+        self._spawned = set()
+        # Maps each type of spawned thing to removed things of that type, ready for reuse
+        self._pools = {}
 
     def get_space(self) -> pymunk.Space:
         """(pymunk.Space): Return the space used by the world."""
         return self._space
 
+    def use_spatial_hash(self, count: int = None):
+        """Switches the broadphase of the space from a bounding box tree to a spatial hash
+
+        The cells of the hash are the size of the cells of the grid, to which all blocks
+        are aligned. A spatial hash is faster for many similarly sized shapes, but its
+        size is fixed, so it should be switched to once the world has been populated.
+
+        Parameters:
+            count (int): The number of cells of the hash table, defaults to ten times the
+                         number of shapes in the world, or the number of grid cells in the
+                         world if that is smaller
+        """
+        if count is None:
+            columns, rows = self._grid_size
+            count = min(10 * len(self._space.shapes), columns * rows)
+        self._space.use_spatial_hash(self._cell_expanse, max(count, 1))
+
     def _create_boundaries(self, thickness):
         """Create boundary walls of given 'thickness'"""
         width, height = self._pixel_size
@@ -121,6 +259,7 @@ class World:
                                 top_left, bottom_right, thickness)
 
             self._space.add(wall.get_shape())
+            self._walls.append(wall)
 
     def set_gravity(self, gravity_x, gravity_y):
         """Sets the gravity of the world
@@ -143,28 +282,343 @@ class World:
         """Returns the expanse (width/height) of each grid cell"""
         return self._cell_expanse
 
-    def step(self, game_data):
+    def get_clock(self) -> Clock:
+        """(Clock) Returns the source of time for things in the world"""
+        return self._clock
+
+    def get_time(self) -> float:
+        """(float) Returns the current time of the world's clock, in seconds"""
+        return self._clock.time()
+
+    def get_random(self):
+        """(random.Random) Returns the random number generator used by things in the world"""
+        return self._rng
+
+    def get_active_radius(self) -> float:
+        """(float) Returns the distance from the focus of a step beyond which things
+        are not stepped, or None if all things are stepped
+        """
+        return self._active_radius
+
+    def set_active_radius(self, radius: float):
+        """Sets the distance from the focus of a step beyond which things are not stepped
+
+        Parameters:
+            radius (float): The active radius, or None to step all things
+        """
+        self._active_radius = radius
+
+    def step(self, game_data, focus: Tuple[float, float] = None):
         """Steps the game world forward by one time step
 
         1. Advances all things in the game world forward by one time step
             step method is called on each thing, with:
-                - time_delta: the time (in seconds) since the last step
+                - time_delta: the time (in seconds) of a step, i.e. STEP_SIZE
                 - game_data: the game_data parameter supplied to this method
         2. Applies/resolves physics
+        3. Advances the world's clock by one time step
+        4. Calls each scheduled callback which has become due (see schedule)
+
+        If both a focus and an active radius are given, only things within the square
+        extending the active radius from the focus are advanced, though all things are
+        still subject to physics. The square is found by querying the space, so the
+        cost of a step does not depend on the number of things outside it. Things which do not override Entity.step, such as
+        blocks and merged blocks, are never advanced, as they have no behaviour. Nor are
+        things whose bodies are asleep, unless they cannot sleep (see Entity.can_sleep),
+        in which case they are woken.
+
+        Things added or removed while physics is applied (i.e. by collision callbacks)
+        are queued, and added to or removed from the space together once physics has
+        been applied. Things queued for removal take no further part in collisions.
 
         Parameters:
             game_data (tuple<World, Player>): Arbitrary data to be passed on to all things
+            focus (tuple<float, float>): The (x, y) position around which things are active
         """
-        now = time.time()
-        time_delta = now - self._last_time
-        for shape in self._space.shapes:
+        # things added by a step are stepped from the next step
+        if focus is None or self._active_radius is None:
+            things = list(self._steppable)
+        else:
+            things = self._get_active_things(focus, self._active_radius)
+
+        for thing in things:
+            body = thing.get_shape().body
+            if body.is_sleeping:
+                if thing.can_sleep():
+                    continue
+                body.activate()
+
+            thing.step(STEP_SIZE, game_data)
+
+        self._stepping = True
+        try:
+            self._space.step(STEP_SIZE)
+        finally:
+            self._stepping = False
+            self._flush()
+        self._clock.advance(STEP_SIZE)
+        self._run_scheduled()
+
+    def _get_active_things(self, focus: Tuple[float, float], radius: float) -> List[Entity]:
+        """(list<Entity>) Returns the steppable things within the square extending 'radius'
+        from the (x, y) focus, in the order they were registered
+        """
+        x, y = focus
+        area = pymunk.BB(x - radius, y - radius, x + radius, y + radius)
+        steppable = self._steppable
+
+        things = [shape.object for shape in self._space.bb_query(area, self._active_filter)
+                  if shape.object in steppable]
+        # blocks are left out of the query, as there are many and few have behaviour
+        things.extend(thing for thing in self._static_steppable
+                      if thing.get_shape().bb.intersects(area))
+
+        things.sort(key=steppable.__getitem__)
+        return things
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> list:
+        """Schedules a callback to be called once the world's time has advanced by 'delay'
+
+        Callbacks are called at the end of the first step at which they are due, in order
+        of due time, then in order of scheduling. The world's time only advances as it is
+        stepped, so only due callbacks are visited, whether or not the game is displayed.
+        Scheduled callbacks are discarded when the world is restored (see restore).
+
+        Parameters:
+            delay (float): The time (in seconds) from now at which the callback is due
+            callback (Callable<> -> None): The function to call
+
+        Returns:
+            (list): A handle to the scheduled callback, which can be cancelled (see cancel)
+        """
+        entry = [self.get_time() + delay, next(self._schedule_sequence), callback]
+        heapq.heappush(self._scheduled, entry)
+        return entry
+
+    def cancel(self, handle: list):
+        """Cancels a scheduled callback, if it has not been called already
+
+        Parameters:
+            handle (list): The handle returned when the callback was scheduled
+        """
+        handle[2] = None
+
+    def _run_scheduled(self):
+        """Calls, in order, each scheduled callback which is now due"""
+        scheduled = self._scheduled
+        now = self.get_time()
+        while scheduled and scheduled[0][0] <= now:
+            callback = heapq.heappop(scheduled)[2]
+            if callback is not None:
+                callback()
+
+    def _flush(self):
+        """Applies the additions and removals queued during the last physics step"""
+        additions, self._pending_additions = self._pending_additions, []
+        removals, self._pending_removals = self._pending_removals, {}
+
+        for objects in additions:
+            self._attach(*objects)
+
+        for shape in removals:
+            self._remove_shape(shape)
+
+    def _add_objects(self, *objects):
+        """Adds pymunk bodies and shapes to the space, or queues them during a physics step"""
+        if self._stepping:
+            self._pending_additions.append(objects)
+        else:
+            self._attach(*objects)
+
+    def _attach(self, *objects):
+        """Adds pymunk bodies and shapes to the space, and their things to the registries"""
+        self._space.add(*objects)
+        for shape in objects:
+            if isinstance(shape, pymunk.Shape):
+                self._register(shape.object)
+
+    def _detach(self, shape: pymunk.Shape):
+        """Removes a shape, along with its body if dynamic, from the space, and its thing
+        from the registries
+        """
+        if shape.body is self._space.static_body:
+            self._space.remove(shape)
+        else:
+            self._space.remove(shape.body, shape)
+        self._unregister(shape.object)
+
+    def _register(self, thing: Entity):
+        """Adds a thing which has been added to the space to the registries"""
+        if thing is None:
+            return
+
+        if _is_static(thing):
+            self._static[thing] = None
+        else:
+            self._dynamic[thing] = None
+
+        if _has_behaviour(thing.__class__):
+            self._steppable[thing] = next(self._register_sequence)
+            if _is_static(thing):
+                self._static_steppable[thing] = None
+
+    def _unregister(self, thing: Entity):
+        """Removes a thing which has been removed from the space from the registries"""
+        self._static.pop(thing, None)
+        self._dynamic.pop(thing, None)
+        self._steppable.pop(thing, None)
+        self._static_steppable.pop(thing, None)
+
+    def _remove_shape(self, shape: pymunk.Shape):
+        """Removes a shape, along with its body if dynamic, from the space
+
+        During a physics step, the removal is queued instead (see step).
+        Removing a shape which has already been removed has no effect.
+        """
+        if self._stepping:
+            self._pending_removals[shape] = None
+            return
+
+        # Static shapes belong to blocks, which are only removed while present in the grid
+        body = shape.body
+        if body is self._space.static_body:
+            self._detach(shape)
+        elif body.space is self._space:
+            self._detach(shape)
+            self._release(shape.object)
+
+    def update(self, elapsed: float, game_data, focus: Tuple[float, float] = None) -> int:
+        """Advances the game world by an amount of elapsed time, in fixed steps
+
+        Elapsed time is accumulated, and the world is stepped once for each STEP_SIZE
+        of accumulated time, up to MAX_CATCH_UP_STEPS times, after which any remaining
+        whole steps are dropped. Time left over is carried into the next update, and is
+        used to interpolate the positions of things between their last two steps
+        (see get_render_displacement).
+
+        Parameters:
+            elapsed (float): The time (in seconds) since the last update
+            game_data (tuple<World, Player>): Arbitrary data to be passed on to all things
+            focus (tuple<float, float>): The (x, y) position around which things are active
+
+        Returns:
+            (int): The number of steps taken
+        """
+        self._accumulator += elapsed
+
+        steps = int(self._accumulator // STEP_SIZE)
+        if steps > MAX_CATCH_UP_STEPS:
+            self._accumulator -= (steps - MAX_CATCH_UP_STEPS) * STEP_SIZE
+            steps = MAX_CATCH_UP_STEPS
+
+        for i in range(steps):
+            if i == steps - 1:
+                self._previous_positions = {body: tuple(body.position)
+                                            for body in self._space.bodies}
+            self.step(game_data, focus)
+            self._accumulator -= STEP_SIZE
+
+        return steps
+
+    def get_interpolation(self) -> float:
+        """(float) Returns the fraction of a step accumulated but not yet stepped through"""
+        return self._accumulator / STEP_SIZE
+
+    def get_render_displacement(self, thing: Entity) -> Tuple[float, float]:
+        """(tuple<float, float>) Returns the (x, y) displacement of a thing from its current
+        position to its interpolated position between its last two steps
+        """
+        body = thing.get_shape().body
+        previous = self._previous_positions.get(body)
+        if previous is None:
+            return 0, 0
+
+        remaining = 1 - self.get_interpolation()
+        x, y = body.position
+        return (previous[0] - x) * remaining, (previous[1] - y) * remaining
+
+    def snapshot(self) -> WorldSnapshot:
+        """(WorldSnapshot) Captures the current state of the world, such that it can be restored
+
+        The snapshot contains the shapes & bodies in the world, the motion of each body and
+        a shallow copy of the attributes of each thing. Merged blocks have no state of their
+        own, so only their groups are captured.
+        """
+        shapes = set(self._space.shapes)
+        bodies = {body: (tuple(body.position), tuple(body.velocity),
+                         body.angle, body.angular_velocity)
+                  for body in self._space.bodies}
+
+        things = {}
+        for shape in shapes:
             thing = shape.object
+            if thing is not None:
+                things[thing] = _get_state(thing)
+
+        return WorldSnapshot(shapes, bodies, things, list(self._block_grid))
+
+    def restore(self, snapshot: WorldSnapshot):
+        """Restores the world to the state captured by a snapshot of this world
 
-            if thing:
-                thing.step(time_delta, game_data)
+        Things added since the snapshot are removed, things removed since the snapshot are
+        added again, and all things captured are reset to their captured state. Collision
+        handlers are kept, but scheduled callbacks are discarded (see schedule). Blocks whose
+        presence or attributes changed are recorded as changed (see pop_block_changes).
 
-        self._space.step(STEP_SIZE)
-        self._last_time = now
+        Parameters:
+            snapshot (WorldSnapshot): A snapshot previously taken of this world
+        """
+        current = set(self._space.shapes)
+        removed = current - snapshot.shapes
+        added = snapshot.shapes - current
+
+        for shape in removed:
+            self._space.remove(shape)
+            if _is_static(shape.object):
+                self._block_changes[shape.object] = False
+
+        bodies = set(self._space.bodies)
+        for body in bodies - snapshot.bodies.keys():
+            self._space.remove(body)
+        for body in snapshot.bodies.keys() - bodies:
+            self._space.add(body)
+
+        for shape in added:
+            self._space.add(shape)
+            if _is_static(shape.object):
+                self._block_changes[shape.object] = True
+
+        for body, (position, velocity, angle, angular_velocity) in snapshot.bodies.items():
+            body.position = position
+            body.velocity = velocity
+            body.angle = angle
+            body.angular_velocity = angular_velocity
+
+        for thing, state in snapshot.things.items():
+            if _get_state(thing) != state:
+                _set_state(thing, state)
+                if isinstance(thing, Block):
+                    self._block_changes[thing] = True
+
+        self._block_grid[:] = snapshot.block_grid
+
+        self._steppable.clear()
+        self._static_steppable.clear()
+        self._dynamic.clear()
+        self._static.clear()
+        for shape in self._space.shapes:
+            if not isinstance(shape.object, BoundaryWall):
+                self._register(shape.object)
+
+        self._accumulator = 0
+        self._previous_positions = {}
+
+        # Scheduled callbacks act on the state being discarded
+        self._scheduled.clear()
+
+        # Pooled things may have been restored, so they can no longer be reused
+        self._spawned.clear()
+        self._pools.clear()
 
     def xy_to_grid(self, x: float, y: float) -> Tuple[int, int]:
         """Converts pixel position (xy) to grid position"""
@@ -182,11 +636,33 @@ class World:
         """Wraps a pymunk collision callback into a more OOP form"""
 
         def wrapped_callback(arbiter, space, data):
-            thing_a, thing_b = [s.object for s in arbiter.shapes]
+            shape_a, shape_b = arbiter.shapes
+            if shape_a in self._pending_removals or shape_b in self._pending_removals:
+                return False
+            thing_a = self._resolve_collision_thing(arbiter, shape_a, shape_b)
+            thing_b = self._resolve_collision_thing(arbiter, shape_b, shape_a)
             return callback(thing_a, thing_b, data['data'], arbiter)
 
         return wrapped_callback
 
+    def _resolve_collision_thing(self, arbiter, shape, other):
+        """(Entity) Returns the thing of a shape involved in a collision
+
+        For the shape of a group of blocks, this is the block of the group at the point of contact
+        (see get_group_block).
+        """
+        thing = shape.object
+        if not isinstance(thing, BlockGroup):
+            return thing
+
+        points = arbiter.contact_point_set.points
+        if points:
+            point = points[0].point_a if shape is arbiter.shapes[0] else points[0].point_b
+        else:
+            point = other.bb.center()
+
+        return self.get_group_block(thing, *self.xy_to_grid(*point))
+
     def add_collision_handler(self, collision_type_a, collision_type_b, data=None,
                               on_begin=None, on_separate=None, on_pre_solve=None, on_post_solve=None):
         """Adds a collision handler to the game world
@@ -206,18 +682,112 @@ class World:
             if callback:
                 setattr(handler, key, self._wrap_callback(callback))
 
+    def add_collision_dispatch(self, collision_type_a, id_a, collision_type_b, id_b, data=None,
+                               on_begin=None, on_separate=None, on_pre_solve=None,
+                               on_post_solve=None):
+        """Routes collisions between things of the given collision types and ids to callbacks
+
+        Callbacks are found by a lookup on the ids of the colliding things, trying the ids
+        of both things, then the first id alone, then the second id alone, then neither.
+        The id of the second thing is only resolved if the first thing has callbacks.
+        Collisions without a callback are valid. An event of a pair of collision types
+        should be handled by either this method or add_collision_handler, not both.
+
+        Parameters:
+            collision_type_a (str): The collision type of the first thing
+            id_a (str): The id of the first thing (see get_id), or None to match any thing
+            collision_type_b (str): The collision type of the second thing
+            id_b (str): The id of the second thing, or None to match any thing
+
+            - See add_collision_handler for other parameters
+        """
+        handler = self._space.add_collision_handler(self._collision_types[collision_type_a],
+                                                    self._collision_types[collision_type_b])
+        tables = self._dispatch_tables.setdefault((collision_type_a, collision_type_b), {})
+
+        local_variables = locals()
+
+        for key in COLLISION_HANDLER_CALLBACKS:
+            callback = local_variables[f"on_{key}"]
+            if not callback:
+                continue
+
+            table = tables.get(key)
+            if table is None:
+                table = tables[key] = {}
+                setattr(handler, key, self._dispatch_callback(table))
+            table.setdefault(id_a, {})[id_b] = (callback, data)
+
+    def _dispatch_callback(self, table):
+        """Wraps a table of callbacks by thing ids into a pymunk collision callback
+        (see add_collision_dispatch)
+        """
+
+        def dispatch(arbiter, space, data):
+            shape_a, shape_b = arbiter.shapes
+            if shape_a in self._pending_removals or shape_b in self._pending_removals:
+                return False
+
+            # ids are only looked up if callbacks were added for specific ids
+            thing_a = self._resolve_collision_thing(arbiter, shape_a, shape_b)
+            row = table.get(thing_a.get_id()) if len(table) > (None in table) else None
+            any_row = table.get(None)
+            if row is None and any_row is None:
+                return True
+
+            thing_b = self._resolve_collision_thing(arbiter, shape_b, shape_a)
+            for row in (row, any_row):
+                if row is None:
+                    continue
+                entry = row.get(thing_b.get_id()) if len(row) > (None in row) else None
+                if entry is None:
+                    entry = row.get(None)
+                if entry is not None:
+                    callback, callback_data = entry
+                    return callback(thing_a, thing_b, callback_data, arbiter)
+
+            return True
+
+        return dispatch
+
+    def ignore_collisions(self, category_a: str, category_b: str):
+        """Stops things of two categories from colliding with one another
+
+        Such collisions are rejected by pymunk, before any collision callback is called.
+
+        Parameters:
+            category_a (str): A thing category, as in PHYSICAL_THING_CATEGORIES
+            category_b (str): Another thing category, as in PHYSICAL_THING_CATEGORIES
+        """
+        a, b = self._thing_categories[category_a], self._thing_categories[category_b]
+        masks = self._collision_masks
+        masks[a] = masks.get(a, pymunk.ShapeFilter.ALL_MASKS) & ~b
+        masks[b] = masks.get(b, pymunk.ShapeFilter.ALL_MASKS) & ~a
+
+        for shape in self._space.shapes:
+            categories = shape.filter.categories
+            if categories in masks:
+                shape.filter = pymunk.ShapeFilter(shape.filter.group, categories, masks[categories])
+
     def get_all_things(self) -> Iterable[Entity]:
         """Yields all physical things in this world, including boundary walls
 
+        Note: Each block of every group of merged blocks is created if it has not been
+              already (see get_group_block).
+
         Yield:
             Entity
         """
-        for shape in self._space.shapes:
-            thing = shape.object
+        yield from self._walls
 
-            if thing:
+        for thing in list(self._static):
+            if isinstance(thing, BlockGroup):
+                yield from self._get_group_blocks(thing)
+            else:
                 yield thing
 
+        yield from list(self._dynamic)
+
     def add_thing(self, thing: Entity, x: float, y: float, size: Tuple[float, float], collision_type=None,
                   categories=None, mass: float = 1, friction: float = 1):
         """Adds a thing to the game world centred at the position ('x', 'y')
@@ -230,7 +800,7 @@ class World:
             collision_type (int): The collision type of the thing; should be a value of self._collision_types
             categories (int): The query categories of the thing; should be a bitwise combination of the
                               value of self._physical_thing_categories
-            mass (float): The mass of the thing
+            mass (float): The mass of the thing, or 0 for a weightless thing, which does not fall
             friction (float): The friction of the thing
         """
         width, height = size
@@ -240,7 +810,13 @@ class World:
         top = -height // 2
         bottom = top + height
 
-        body = pymunk.Body(mass, pymunk.inf)
+        if mass == 0:
+            # pymunk would make the motion of a massless body NaN, so weightless things are
+            # given a nominal mass instead, and are not subject to gravity
+            body = pymunk.Body(1, pymunk.inf)
+            body.velocity_func = _update_weightless_velocity
+        else:
+            body = pymunk.Body(mass, pymunk.inf)
         body.position = x, y
         shape = pymunk.Poly(body, [(left, top), (left, bottom), (right, bottom), (right, top)])
 
@@ -249,16 +825,24 @@ class World:
             shape.collision_type = collision_type
 
         if categories is not None:
-            shape.filter = pymunk.ShapeFilter(categories=categories)
+            shape.filter = pymunk.ShapeFilter(categories=categories,
+                                              mask=self._collision_masks.get(
+                                                  categories, pymunk.ShapeFilter.ALL_MASKS))
 
         shape.friction = friction
 
         thing.set_shape(shape)
-        self._space.add(body, shape)
+        self._add_objects(body, shape)
 
     def remove_thing(self, thing: Entity):
-        """Removes a thing from the world"""
-        self._space.remove(thing.get_shape())
+        """Removes a thing from the world, if it is still present
+
+        Blocks are removed from the grid as well (see remove_block).
+        """
+        if isinstance(thing, Block):
+            self.remove_block(thing)
+        else:
+            self._remove_shape(thing.get_shape())
 
     def add_player(self, player: Player, x: float, y: float, mass: float = 100, friction: float = .5):
         """Adds a player to game world at the position ('x', 'y')"""
@@ -275,11 +859,11 @@ class World:
 
         player.set_shape(shape)
 
-        self._space.add(body, shape)
+        self._add_objects(body, shape)
 
     def remove_player(self, player: Player):
         """Removes the player from the game world"""
-        self._space.remove(player.get_shape())
+        self._remove_shape(player.get_shape())
 
     def add_block_to_grid(self, entity, column: int, row: int,
                          width: int, height: int, friction: float = 1.):
@@ -294,21 +878,94 @@ class World:
             friction (float): The friction on the surface of the block
         """
 
+        shape = self._create_block_shape(entity, column, row, width, height, friction)
+        entity.set_shape(shape)
+        self._add_objects(shape)
+        self._index_block(entity, column, row, width, height, entity)
+        self._block_changes[entity] = True
+
+    def add_blocks(self, blocks: Dict[Tuple[int, int], Union[Block, type]], friction: float = 1.,
+                   merge: bool = False):
+        """Adds many single cell plain blocks to the game world at once
+
+        Parameters:
+            blocks (dict<tuple<int, int>: Block | type>): The blocks to add, by (column, row)
+                grid cell. A block type (see plain_block_type) adds a block of that type.
+            friction (float): The friction on the surface of the blocks
+            merge (bool): If True, the blocks are added straight into groups which share shapes,
+                          as if by merge_blocks. Blocks given by their type are then only
+                          created when they are needed (see get_group_block)
+        """
+        if merge:
+            self._add_block_groups(blocks, friction)
+            return
+
+        for (column, row), block in blocks.items():
+            if isinstance(block, type):
+                block = block()
+            block.set_shape(self._create_block_shape(block, column, row, 1, 1, friction))
+            self._attach(block.get_shape())
+            self._index_block(block, column, row, 1, 1, block)
+            self._block_changes[block] = True
+
+    def _create_block_shape(self, block: Block, column: int, row: int, width: float,
+                            height: float, friction: float) -> pymunk.Shape:
+        """(pymunk.Shape) Returns a new shape for a block covering the given grid cells,
+        which has not been added to the world's space
+        """
         left = column * self._cell_expanse
         right = (column + width) * self._cell_expanse
         top = row * self._cell_expanse
         bottom = (row + height) * self._cell_expanse
 
         shape = pymunk.Poly(self._space.static_body, [(left, top), (left, bottom), (right, bottom), (right, top)])
-        shape.object = entity
+        shape.object = block
         shape.group = 2
 
         shape.friction = friction
         shape.collision_type = self._collision_types["block"]
         shape.filter = pymunk.ShapeFilter(categories=self._thing_categories["block"])
 
-        entity.set_shape(shape)
-        self._space.add(shape)
+        # the bounding box is otherwise only computed once the shape is added to a space,
+        # which the shapes of merged blocks never are
+        shape.cache_bb()
+        return shape
+
+    def _index_block(self, block: Block, column: int, row: int, width: float, height: float,
+                     value):
+        """Sets the cells of the block index covered by a block to 'value'
+
+        Only cells which are currently empty or contain the block itself are set.
+        """
+        columns, rows = self._grid_size
+        grid = self._block_grid
+        for c in range(max(column, 0), min(column + max(math.ceil(width), 1), columns)):
+            for r in range(max(row, 0), min(row + max(math.ceil(height), 1), rows)):
+                index = c * rows + r
+                if grid[index] is None or grid[index] is block:
+                    grid[index] = value
+
+    def _get_block_cells(self, block: Block) -> Tuple[int, int, float, float]:
+        """(tuple<int, int, float, float>) Returns the (column, row) of the top-left grid cell
+        occupied by a block, and its (width, height) in cells
+        """
+        bb = block.get_shape().bb
+        column, row = self.xy_to_grid(bb.left, bb.bottom)
+        width, height = (bb.right - bb.left) / self._cell_expanse, (bb.top - bb.bottom) / self._cell_expanse
+        return column, row, width, height
+
+    def _unindex_block(self, block: Block):
+        """Clears the cells of the block index occupied by a block"""
+        self._index_block(block, *self._get_block_cells(block), None)
+
+    def _index_static(self, thing: Entity, present: bool):
+        """Sets or clears the cells of the block index occupied by a block or group of blocks"""
+        if isinstance(thing, BlockGroup):
+            self._index_block(thing, *thing.get_rectangle(), thing if present else None)
+        elif present:
+            self._index_block(thing, *self._get_block_cells(thing), thing)
+        else:
+            self._unindex_block(thing)
 
     def add_block(self, block: Block, x: float, y: float, *args, **kwargs):
         """Adds a block to the game world at the grid cell that contains ('x', 'y')
@@ -331,14 +988,300 @@ class World:
         Note: It is technically possible for multiple blocks to overlap, in which case
               this method will return one of those. This should never happen, though.
         """
-        blocks = self._space.point_query((x, y), 0, pymunk.ShapeFilter(mask=self._thing_categories["block"]))
+        column, row = self.xy_to_grid(x, y)
+        columns, rows = self._grid_size
+        if not (0 <= column < columns and 0 <= row < rows):
+            return None
+
+        block = self._block_grid[column * rows + row]
+        if isinstance(block, BlockGroup):
+            return self.get_group_block(block, column, row)
 
-        if blocks:
-            return blocks[0].shape.object
+        # blocks which only partly cover their cells must contain the point itself
+        if block is not None and block.get_cell_size() != (1, 1):
+            bb = block.get_shape().bb
+            if not (bb.left <= x <= bb.right and bb.bottom <= y <= bb.top):
+                return None
+
+        return block
+
+    def get_group_block(self, group: BlockGroup, column: int, row: int) -> Block:
+        """(Block) Returns the block of a group nearest to the grid cell ('column', 'row')
+
+        Merged blocks are only kept as their type until they are needed, so the block
+        is created, with its own shape, the first time it is returned.
+        """
+        block = group.get_cell(column, row)
+        if isinstance(block, type):
+            left, top, width, height = group.get_rectangle()
+            column = min(max(column, left), left + width - 1)
+            row = min(max(row, top), top + height - 1)
+
+            block = block()
+            block.set_shape(self._create_block_shape(block, column, row, 1, 1,
+                                                     group.get_shape().friction))
+            group.set_cell(column, row, block)
+
+        return block
+
+    def _get_group_blocks(self, group: BlockGroup, first_column: int = None, first_row: int = None,
+                          last_column: int = None, last_row: int = None) -> List[Block]:
+        """(list<Block>) Returns the blocks of a group within the given grid cells (inclusive),
+        defaulting to the whole group (see get_group_block)
+        """
+        left, top, width, height = group.get_rectangle()
+        first_column = left if first_column is None else max(first_column, left)
+        first_row = top if first_row is None else max(first_row, top)
+        last_column = left + width - 1 if last_column is None else min(last_column, left + width - 1)
+        last_row = top + height - 1 if last_row is None else min(last_row, top + height - 1)
+
+        return [self.get_group_block(group, column, row)
+                for column in range(first_column, last_column + 1)
+                for row in range(first_row, last_row + 1)]
+
+    def _get_grid_things(self, first: int, last: int) -> List[Entity]:
+        """(list<Block | BlockGroup>) Returns the blocks & groups of blocks occupying the grid
+        columns from 'first' to 'last' inclusive, without creating any merged blocks
+        """
+        rows = self._grid_size[1]
+        first = max(first, 0)
+        last = min(last, self._grid_size[0] - 1)
+
+        things = {}
+        for thing in self._block_grid[first * rows:(last + 1) * rows]:
+            if thing is not None:
+                things[thing] = None
+
+        return list(things)
+
+    def get_blocks_in_radius(self, x: float, y: float, radius: float,
+                             block_id: str = None) -> List[Block]:
+        """(list<Block>) Returns all blocks within 'radius' from the point ('x', 'y')
+
+        A block is within range if any part of the grid cells it occupies is in range.
+
+        Parameters:
+            x (float): The x-coordinate of the point
+            y (float): The y-coordinate of the point
+            radius (float): The maximum distance from the point
+            block_id (str): If given, only blocks with this id are returned
+        """
+        columns, rows = self._grid_size
+        first_column, first_row = self.xy_to_grid(x - radius, y - radius)
+        last_column, last_row = self.xy_to_grid(x + radius, y + radius)
+
+        blocks = {}
+        for column in range(max(first_column, 0), min(last_column + 1, columns)):
+            left, _ = self.grid_to_xy(column, 0)
+            dx = max(left - x, 0, x - left - self._cell_expanse)
+
+            for row in range(max(first_row, 0), min(last_row + 1, rows)):
+                block = self._block_grid[column * rows + row]
+                if block is None:
+                    continue
+
+                _, top = self.grid_to_xy(0, row)
+                dy = max(top - y, 0, y - top - self._cell_expanse)
+                if dx * dx + dy * dy > radius * radius:
+                    continue
+
+                if isinstance(block, BlockGroup):
+                    cell = block.get_cell(column, row)
+                    cell_id = cell._id if isinstance(cell, type) else cell.get_id()
+                    if block_id is not None and cell_id != block_id:
+                        continue
+                    block = self.get_group_block(block, column, row)
+                elif block_id is not None and block.get_id() != block_id:
+                    continue
+
+                blocks[block] = None
+
+        return list(blocks)
+
+    def get_things_in_columns(self, first: int, last: int) -> List[Entity]:
+        """(list<Entity>) Returns all things within the grid columns from 'first' to 'last'
+        inclusive, other than the player & boundary walls
+
+        A block, or group of merged blocks, is within the columns if its left-most column is,
+        whereas any other thing is within the columns if its centre is. Merged blocks are
+        returned as their group.
+        """
+        things = []
+        for thing in self._get_grid_things(first, last):
+            column = (thing.get_rectangle()[0] if isinstance(thing, BlockGroup)
+                      else self._get_block_cells(thing)[0])
+            if first <= column <= last:
+                things.append(thing)
+
+        left, _ = self.grid_to_xy(first, 0)
+        right, _ = self.grid_to_xy(last + 1, 0)
+        for shape in self._space.bb_query(pymunk.BB(left, 0, right, self._pixel_size[1]),
+                                          pymunk.ShapeFilter(mask=self._thing_categories["item"]
+                                                             | self._thing_categories["mob"])):
+            thing = shape.object
+            if thing is not None and left <= thing.get_position()[0] < right:
+                things.append(thing)
+
+        return things
+
+    def get_columns_state(self, first: int, last: int) -> dict:
+        """(dict<Entity: dict>) Returns the state of the things within the grid columns from
+        'first' to 'last' inclusive, such that changes to them can be detected by comparison
+
+        Only the attributes of blocks with behaviour are captured (see is_plain_block). Other
+        things are only captured by their presence, so a mob entering or leaving the columns
+        is a change, but a mob moving within them is not.
+        """
+        state = {}
+        for thing in self.get_things_in_columns(first, last):
+            has_state = isinstance(thing, Block) and not self.is_plain_block(thing)
+            state[thing] = _get_state(thing) if has_state else None
+
+        return state
+
+    def remove_columns(self, first: int, last: int) -> List[pymunk.Shape]:
+        """Removes all things within the grid columns from 'first' to 'last' inclusive
+        (see get_things_in_columns) from the world
+
+        Blocks merged into a group are removed along with their group, so the columns should
+        have been merged separately from their neighbours (see merge_blocks).
+
+        Returns:
+            (list<pymunk.Shape>): The removed shapes, which can be added again (see add_shapes)
+        """
+        shapes = [thing.get_shape() for thing in self.get_things_in_columns(first, last)]
+
+        for shape in shapes:
+            # shapes are kept to be added again, so spawned things are not reused
+            self._detach(shape)
+
+            if _is_static(shape.object):
+                self._index_static(shape.object, False)
+                self._block_changes[shape.object] = False
+
+        return shapes
+
+    def add_shapes(self, shapes: Iterable[pymunk.Shape]):
+        """Adds shapes previously removed from this world back into it
+        (see remove_columns and remove_block)
+        """
+        for shape in shapes:
+            if shape.body is not self._space.static_body:
+                self._add_objects(shape.body, shape)
+            else:
+                self._add_objects(shape)
+
+            if _is_static(shape.object):
+                self._index_static(shape.object, True)
+                self._block_changes[shape.object] = True
 
     def remove_block(self, block: Block):
-        """Removes a block from the game world"""
-        self.remove_thing(block)
+        """Removes a block from the game world, if it is still present
+
+        If the block has been merged into a group, the group is split around it.
+        """
+        column, row, _, _ = self._get_block_cells(block)
+        columns, rows = self._grid_size
+        if not (0 <= column < columns and 0 <= row < rows):
+            return
+        present = self._block_grid[column * rows + row]
+
+        if isinstance(present, BlockGroup) and present.get_cell(column, row) is block:
+            group = present
+            self._remove_shape(group.get_shape())
+            self._index_static(group, False)
+            self._block_changes[group] = False
+
+            remaining = {(c, r): cell for c, r, cell in group.get_cells()
+                         if cell is not block}
+            self._add_block_groups(remaining, group.get_shape().friction)
+        elif present is block:
+            self._unindex_block(block)
+            self._remove_shape(block.get_shape())
+        else:
+            return
+
+        self._block_changes[block] = False
+
+    @staticmethod
+    def is_plain_block(block: Block) -> bool:
+        """(bool) Returns True iff the block occupies a single cell and has no behaviour,
+        such that it can be merged with its neighbours (see merge_blocks)
+        """
+        cls = block.__class__
+        return (block.get_cell_size() == (1, 1)
+                and cls.step is Entity.step and cls.on_hit is Entity.on_hit)
+
+    def merge_blocks(self, first_column: int = 0, last_column: int = None):
+        """Merges adjacent plain blocks in the world into rectangular groups which each
+        share a single physical shape, reducing the number of shapes in the world.
+
+        Blocks with behaviour keep their own shape (see is_plain_block). When a merged
+        block is removed, the remainder of its group is merged again.
+
+        Parameters:
+            first_column (int): The first grid column of the blocks to merge
+            last_column (int): The last grid column of the blocks to merge, defaults to the
+                               last column of the grid
+        """
+        if last_column is None:
+            last_column = self._grid_size[0] - 1
+
+        cells = {}
+        for block in self._get_grid_things(first_column, last_column):
+            if isinstance(block, Block) and self.is_plain_block(block):
+                cell = self.xy_to_grid(*block.get_position())
+                cells.setdefault(block.get_shape().friction, {})[cell] = block
+
+        for friction, blocks in cells.items():
+            for block in blocks.values():
+                self._detach(block.get_shape())
+                self._unindex_block(block)
+                self._block_changes[block] = False
+            self._add_block_groups(blocks, friction)
+
+    def _add_block_groups(self, blocks, friction):
+        """Adds the given blocks to the world as groups of blocks which share a shape
+
+        Parameters:
+            blocks (dict<tuple<int, int>: Block | type>): The blocks, or block types, to add
+                                                          by grid cell
+            friction (float): The friction on the surface of the groups
+        """
+        for column, row, width, height in merge_cells(blocks):
+            left, top = self.grid_to_xy(column, row)
+            right, bottom = self.grid_to_xy(column + width, row + height)
+
+            cells = [blocks[c, r] for c in range(column, column + width)
+                     for r in range(row, row + height)]
+            group = BlockGroup(cells, (column, row, width, height))
+
+            shape = pymunk.Poly(self._space.static_body, [(left, top), (left, bottom),
+                                                          (right, bottom), (right, top)])
+            shape.object = group
+            shape.friction = friction
+            shape.collision_type = self._collision_types["block"]
+            shape.filter = pymunk.ShapeFilter(categories=self._thing_categories["block"])
+
+            group.set_shape(shape)
+            self._add_objects(shape)
+            self._index_static(group, True)
+            self._block_changes[group] = True
+
+    def mark_changed(self, block: Block):
+        """Records that the state of a block in the world has changed, such that it
+        may need to be redrawn.
+        """
+        self._block_changes[block] = True
+
+    def pop_block_changes(self) -> dict:
+        """(dict<Block | BlockGroup: bool>) Returns all blocks, and groups of merged blocks,
+        added, removed or changed since this method was last called, mapped to whether they
+        are still present in the world.
+        """
+        changes = self._block_changes
+        self._block_changes = {}
+        return changes
 
     def add_item(self, item: DroppedItem, x: float, y: float, size: Tuple[float, float] = (8, 8),
                  mass: float = 2, friction: float = 1.):
@@ -374,12 +1317,101 @@ class World:
         """Removes a mob from the world"""
         self.remove_thing(mob)
 
+    def spawn_item(self, item_type: type, x: float, y: float, **kwargs) -> DroppedItem:
+        """Adds an item of the given type to the game world centred at the position ('x', 'y')
+
+        Items of the same type removed from the world since being spawned are reused, along
+        with their physical body, before new items are created (see POOL_SIZE).
+
+        Parameters:
+            item_type (type): The type of DroppedItem to spawn, constructed without arguments
+
+            - See add_item for other parameters
+
+        Returns:
+            (DroppedItem): The spawned item
+        """
+        item = self._acquire(item_type, x, y)
+        if item is None:
+            item = item_type()
+            self.add_item(item, x, y, **kwargs)
+            self._spawned.add(item)
+        return item
+
+    def spawn_mob(self, mob_type: type, x: float, y: float, **kwargs) -> Mob:
+        """Adds a mob of the given type to the game world centred at the position ('x', 'y')
+
+        Mobs are reused in the same way as items (see spawn_item).
+
+        Parameters:
+            mob_type (type): The type of Mob to spawn, constructed without arguments
+
+            - See add_mob for other parameters
+
+        Returns:
+            (Mob): The spawned mob
+        """
+        mob = self._acquire(mob_type, x, y)
+        if mob is None:
+            mob = mob_type()
+            self.add_mob(mob, x, y, **kwargs)
+            self._spawned.add(mob)
+        return mob
+
+    def _acquire(self, thing_type: type, x: float, y: float):
+        """Adds a pooled thing of the given type back into the world at ('x', 'y')
+
+        The thing is reset (see DynamicEntity.reset), and its body is placed at rest.
+
+        Returns:
+            (DynamicEntity): The reused thing, or None if none of the type are pooled
+        """
+        pool = self._pools.get(thing_type)
+        if not pool:
+            return None
+
+        thing = pool.pop()
+        thing.reset()
+
+        shape = thing.get_shape()
+        body = shape.body
+        body.position = x, y
+        body.velocity = 0, 0
+        body.force = 0, 0
+        self._previous_positions.pop(body, None)
+
+        self._add_objects(body, shape)
+        self._spawned.add(thing)
+        return thing
+
+    def _release(self, thing: Entity):
+        """Keeps a spawned thing, which has been removed from the world, for reuse"""
+        if thing not in self._spawned:
+            return
+        self._spawned.discard(thing)
+
+        pool = self._pools.setdefault(type(thing), [])
+        if len(pool) < POOL_SIZE:
+            pool.append(thing)
+
     def get_things_in_range(self, x: float, y: float, distance: float):
         """(list<Entity>) Returns all things within the given distance range from point ('x', 'y')"""
         queries = self._space.point_query((x, y), distance, pymunk.ShapeFilter(
             mask=pymunk.ShapeFilter.ALL_MASKS ^ self._thing_categories["wall"]))
 
-        return [q.shape.object for q in queries]
+        things = []
+        for query in queries:
+            thing = query.shape.object
+            if isinstance(thing, BlockGroup):
+                first_column, first_row = self.xy_to_grid(x - distance, y - distance)
+                last_column, last_row = self.xy_to_grid(x + distance, y + distance)
+                things.extend(block for block in self._get_group_blocks(thing, first_column, first_row,
+                                                                        last_column, last_row)
+                              if block.get_shape().point_query((x, y)).distance <= distance)
+            else:
+                things.append(thing)
+
+        return things
 
     def get_things(self, x: float, y: float) -> [Entity]:
         """(list<Entity>) Returns all things on the point ('x', 'y')"""
@@ -394,6 +1426,43 @@ class World:
         things = self.get_things(x, y)
         return things[0] if things else None
 
+    def get_things_in_area(self, left: float, top: float, right: float, bottom: float,
+                           categories: Iterable[str] = None) -> [Entity]:
+        """(list<Entity>) Returns all things which overlap the rectangle with the given edges
+
+        Parameters:
+            left (float): The smallest x-coordinate of the rectangle
+            top (float): The smallest y-coordinate of the rectangle
+            right (float): The largest x-coordinate of the rectangle
+            bottom (float): The largest y-coordinate of the rectangle
+            categories (iterable<str>): The names of the thing categories to include,
+                                        defaults to all categories except walls
+        """
+        if categories is None:
+            mask = pymunk.ShapeFilter.ALL_MASKS ^ self._thing_categories["wall"]
+        else:
+            mask = 0
+            for category in categories:
+                mask |= self._thing_categories[category]
+
+        # pymunk bounding boxes are y-up, so the top of the rectangle is the bottom of the box
+        area = pymunk.BB(left, top, right, bottom)
+        shapes = self._space.bb_query(area, pymunk.ShapeFilter(mask=mask))
+
+        things = []
+        for shape in shapes:
+            thing = shape.object
+            if isinstance(thing, BlockGroup):
+                first_column, first_row = self.xy_to_grid(left, top)
+                last_column, last_row = self.xy_to_grid(right, bottom)
+                things.extend(block for block in self._get_group_blocks(thing, first_column, first_row,
+                                                                        last_column, last_row)
+                              if block.get_shape().bb.intersects(area))
+            elif thing:
+                things.append(thing)
+
+        return things
+
     def get_items(self, x: float, y: float, max_distance: float) -> [DroppedItem]:
         """(list<DroppedItem>) Returns all items within 'max_distance' from the point ('x', 'y')"""
         queries = self._space.point_query((x, y), max_distance,
@@ -407,3 +1476,50 @@ class World:
                                           pymunk.ShapeFilter(mask=self._thing_categories["mob"]))
 
         return [q.shape.object for q in queries]
+
+
+def _update_weightless_velocity(body: pymunk.Body, gravity, damping: float, dt: float):
+    """Velocity function of the bodies of weightless things, which ignores gravity"""
+    pymunk.Body.update_velocity(body, (0, 0), damping, dt)
+
+
+@functools.lru_cache(maxsize=None)
+def _has_behaviour(cls: type) -> bool:
+    """(bool) Returns True iff a type of thing overrides Entity.step"""
+    return cls.step is not Entity.step
+
+
+@functools.lru_cache(maxsize=None)
+def _get_slots(cls: type) -> Tuple[str, ...]:
+    """(tuple<str, ...>) Returns the names of the slots declared by a class and its bases"""
+    return tuple(name for klass in cls.__mro__
+                 for name in klass.__dict__.get('__slots__', ()))
+
+
+def _get_state(thing: Entity) -> dict:
+    """(dict) Returns a shallow copy of the attributes of a thing, including its slots"""
+    state = dict(getattr(thing, '__dict__', ()))
+    for name in _get_slots(thing.__class__):
+        if hasattr(thing, name):
+            state[name] = getattr(thing, name)
+    return state
+
+
+def _set_state(thing: Entity, state: dict):
+    """Sets the attributes of a thing to a copy of the given state (see _get_state)"""
+    slots = _get_slots(thing.__class__)
+    for name in slots:
+        if name in state:
+            setattr(thing, name, state[name])
+        elif hasattr(thing, name):
+            delattr(thing, name)
+
+    attributes = getattr(thing, '__dict__', None)
+    if attributes is not None:
+        attributes.clear()
+        attributes.update((name, value) for name, value in state.items() if name not in slots)
+
+
+def _is_static(thing: Entity) -> bool:
+    """(bool) Returns True iff a thing is a block or group of blocks"""
+    return isinstance(thing, (Block, BlockGroup))
@@ -4,9 +4,17 @@ tokens of entities.
 
 __version__ = "1.1.0"
 
-from typing import Tuple, Callable, Iterable
+import hashlib
+import struct
+import sys
+import threading
+from array import array
+from typing import Tuple, Callable, Iterable, Iterator, List
 
-from game.world import World
+from game.block import plain_block_type
+from game.clock import Clock
+from game.entity import Entity
+from game.world import World, WorldSnapshot
 
 
 
@@ -16,7 +24,8 @@ class WorldBuilder:
     entity ids by dynamically assigning processors to ids.
     """
     def __init__(self, block_size: int, gravity: Tuple[int, int] = (0, 300),
-                 fallback: Callable = None):
+                 fallback: Callable = None, merge_blocks: bool = False,
+                 clock: Clock = None, rng=None, spatial_hash: bool = False):
         """Construct a new world builder with a specific block size.
 
         The args passed to the fallback callback is determined by what is given
@@ -28,14 +37,28 @@ class WorldBuilder:
             gravity (tuple<int, int>): The gravity of the world.
             fallback (Callable<World, str, int, int, *> -> None): The builder
                 callback to add an entity to the world for an unknown id.
+            merge_blocks (bool): If True, adjacent plain blocks are merged into
+                shared shapes once the world is built (see World.merge_blocks).
+            clock (Clock): The clock of worlds that are built.
+            rng (random.Random): The random number generator of worlds that are built.
+            spatial_hash (bool): If True, worlds that are built use a spatial hash sized to
+                their contents, rather than a bounding box tree (see World.use_spatial_hash).
         """
         # the builders dictionary contains mappings on how to
         # process ids of entities
         self._builders = {}
+        # parameters given to the constructor of each entity id registered with a factory
+        self._parameters = {}
+        # the block types of entity ids which are constructed in bulk as plain blocks
+        self._plain_blocks = {}
         self._entities = []
         self._fallback = fallback
         self._block_size = block_size
         self._gravity = gravity
+        self._merge_blocks = merge_blocks
+        self._clock = clock
+        self._rng = rng
+        self._spatial_hash = spatial_hash
         self._width = 0
         self._height = 0
         
@@ -75,6 +98,53 @@ class WorldBuilder:
         for entity_id in entity_ids:
             self._builders[entity_id] = builder
 
+    def register_factory(self, entity_id: str, factory: Callable[..., Entity],
+                         add: Callable[[World, Entity, float, float], None], **params):
+        """Register a constructor for the entities of an entity id.
+
+        Whenever an entity with the given entity id is encountered during world
+        construction, it is constructed by calling factory(**params), and is then
+        added to the world at the pixel position of its grid cell by calling
+        add(world, entity, x, y), e.g. with World.add_block.
+
+        Parameters:
+            entity_id (str): String identifier for an entity.
+            factory (Callable<*, Entity>): The constructor of the entity.
+            add (Callable<World, Entity, float, float>): Adds the entity to a world.
+            **params: Keyword arguments to the constructor, which can be changed
+                      for each level with set_parameters.
+        """
+        parameters = self._parameters[entity_id] = dict(params)
+        block_size = self._block_size
+
+        def builder(world: World, entity_id: str, x: int, y: int, *args):
+            add(world, factory(**parameters), x * block_size, y * block_size)
+
+        self._builders[entity_id] = builder
+
+    def set_parameters(self, entity_id: str, **params):
+        """Set keyword arguments to the constructor of an entity id registered with
+        register_factory, e.g. the parameters of the level being built.
+
+        Parameters:
+            entity_id (str): String identifier for an entity.
+            **params: Keyword arguments to the constructor.
+        """
+        self._parameters[entity_id].update(params)
+
+    def register_plain_block(self, entity_id: str, block_id: str):
+        """Register an entity id as a plain block (see World.is_plain_block).
+
+        Rather than being constructed one at a time, all plain blocks are added to the
+        world at once by their type (see World.add_blocks and plain_block_type). When
+        blocks are merged, each is only constructed once it is needed.
+
+        Parameters:
+            entity_id (str): String identifier for an entity.
+            block_id (str): The block id of the blocks to construct.
+        """
+        self._plain_blocks[entity_id] = plain_block_type(block_id)
+
     def add_entity(self, entity_id: str, x: int, y: int, *args):
         """Add an entity to the world based on the entity id.
 
@@ -108,22 +178,77 @@ class WorldBuilder:
             KeyError: If there is no associated builder for an entity id and no
                       fallback builder has been set.
         """
-        world = World((self._width, self._height), self._block_size, gravity=self._gravity)
-        for entity in self._entities:
-            entity_id, x, y, args = entity
+        world = self._create_world()
+        self._build_entities(world, self._entities)
 
-            if entity_id not in self._builders:
-                if self._fallback is None:
-                    raise KeyError(f"Unable to build world,"
-                                   f"no matching processor for entity id of {entity_id}")
-                self._fallback(world, *entity)
-                continue
+        if self._merge_blocks:
+            world.merge_blocks()
 
-            processor = self._builders[entity_id]
-            processor(world, entity_id, x, y, *args)
+        if self._spatial_hash:
+            world.use_spatial_hash()
 
         return world
 
+    def build_stream(self, chunk_columns: int, radius: float) -> "LevelStream":
+        """Construct a new world which streams in the added entities in chunks of columns.
+
+        The world is the same size as the one constructed by build, but is initially empty;
+        entity builders are only called as their chunk is loaded (see LevelStream.update).
+
+        Parameters:
+            chunk_columns (int): The number of grid columns in each chunk.
+            radius (float): The distance from the focus of the stream within which chunks
+                            are loaded.
+        """
+        chunks = {}
+        for entity in self._entities:
+            chunks.setdefault(entity[1] // chunk_columns, []).append(entity)
+
+        world = self._create_world()
+        if self._spatial_hash:
+            # the world is empty until streamed in, so the hash is sized for every entity
+            world.use_spatial_hash(10 * len(self._entities))
+
+        return LevelStream(self, world, chunks, chunk_columns, radius)
+
+    def _create_world(self) -> World:
+        """(World) Returns a new empty world, large enough to contain all the added entities."""
+        return World((self._width, self._height), self._block_size, gravity=self._gravity,
+                     clock=self._clock, rng=self._rng)
+
+    def _build_entities(self, world: World, entities: Iterable[tuple]):
+        """Adds added entities to a world, adding all plain blocks in bulk."""
+        plain_blocks = {}
+        for entity in entities:
+            block_type = self._plain_blocks.get(entity[0])
+            if block_type is None:
+                self._build_entity(world, entity)
+            else:
+                _, x, y, _ = entity
+                plain_blocks[x, y] = block_type
+
+        if plain_blocks:
+            world.add_blocks(plain_blocks, merge=self._merge_blocks)
+
+    def _build_entity(self, world: World, entity: tuple):
+        """Calls the builder of an added entity to add it to a world.
+
+        Raises:
+            KeyError: If there is no associated builder for the entity id and no
+                      fallback builder has been set.
+        """
+        entity_id, x, y, args = entity
+
+        if entity_id not in self._builders:
+            if self._fallback is None:
+                raise KeyError(f"Unable to build world,"
+                               f"no matching processor for entity id of {entity_id}")
+            self._fallback(world, *entity)
+            return
+
+        processor = self._builders[entity_id]
+        processor(world, entity_id, x, y, *args)
+
     def clear(self):
         """
         Removes all the entities that were added
@@ -133,43 +258,246 @@ class WorldBuilder:
         self._height = 0
 
 
-def level_size(level: str) -> Tuple[int, int]:
-    """Calculate the rows, columns dimensions of a level from the level string.
+class LevelStream:
+    """A world whose entities are built in chunks of columns as they are approached, and
+    removed again once they are left behind, such that the cost of a level is proportional
+    to the area around its focus rather than its total width.
+
+    A chunk which is modified while it is loaded (e.g. a block is removed, an item is
+    collected, or a mob leaves or enters it) keeps its things when it is removed, and they
+    are added back when the chunk is loaded again. Any other chunk is built afresh each
+    time it is loaded.
+
+    Should be constructed by WorldBuilder.build_stream.
+    """
+
+    def __init__(self, builder: WorldBuilder, world: World, chunks: dict,
+                 chunk_columns: int, radius: float):
+        """Construct a new stream of a world, with no chunks loaded.
+
+        Parameters:
+            builder (WorldBuilder): The builder which is used to build the entities of chunks.
+            world (World): The world to stream entities into.
+            chunks (dict<int: list<tuple>>): The entities added to the builder in each chunk.
+            chunk_columns (int): The number of grid columns in each chunk.
+            radius (float): The distance from the focus within which chunks are loaded.
+        """
+        self._builder = builder
+        self._world = world
+        self._chunks = chunks
+        self._chunk_columns = chunk_columns
+        self._radius = radius
+
+        columns, _ = world.get_grid_size()
+        self._chunk_count = -(-columns // chunk_columns)
+
+        # Maps each loaded chunk to its state when it was loaded (see World.get_columns_state),
+        # or None once it has been modified
+        self._loaded = {}
+        # Shapes of modified chunks which have been removed, by chunk
+        self._detached = {}
+
+    def get_world(self) -> World:
+        """(World) Returns the world that entities are streamed into"""
+        return self._world
+
+    def update(self, x: float):
+        """Loads the chunks within the radius of the focus, and removes loaded chunks which
+        are more than a chunk beyond it.
+
+        Parameters:
+            x (float): The x-coordinate of the focus, e.g. the player
+        """
+        chunk_width = self._chunk_columns * self._world.get_cell_expanse()
+        first = max(int((x - self._radius) // chunk_width), 0)
+        last = min(int((x + self._radius) // chunk_width), self._chunk_count - 1)
+
+        for chunk in list(self._loaded):
+            if chunk < first - 1 or chunk > last + 1:
+                self._unload(chunk)
+
+        for chunk in range(first, last + 1):
+            if chunk not in self._loaded:
+                self._load(chunk)
+
+    def _get_columns(self, chunk: int) -> Tuple[int, int]:
+        """(tuple<int, int>) Returns the first and last grid column of a chunk"""
+        first = chunk * self._chunk_columns
+        return first, first + self._chunk_columns - 1
+
+    def _load(self, chunk: int):
+        """Adds the things of a chunk to the world"""
+        shapes = self._detached.pop(chunk, None)
+        if shapes is not None:
+            self._world.add_shapes(shapes)
+            self._loaded[chunk] = None
+            return
+
+        self._builder._build_entities(self._world, self._chunks.get(chunk, ()))
+        if self._builder._merge_blocks:
+            self._world.merge_blocks(*self._get_columns(chunk))
+
+        self._loaded[chunk] = self._world.get_columns_state(*self._get_columns(chunk))
+
+    def _unload(self, chunk: int):
+        """Removes the things of a chunk from the world, keeping them if it was modified"""
+        state = self._loaded.pop(chunk)
+        columns = self._get_columns(chunk)
+        if state is not None and self._world.get_columns_state(*columns) != state:
+            state = None
+
+        shapes = self._world.remove_columns(*columns)
+        if state is None:
+            self._detached[chunk] = shapes
+
+    def snapshot(self) -> Tuple[WorldSnapshot, dict, dict]:
+        """Captures the current state of the world and the chunks loaded into it.
+
+        Modified chunks which are not loaded are not captured, so a stream should be
+        captured before any chunks are removed, e.g. straight after its first update.
+
+        Returns:
+            (tuple<WorldSnapshot, dict, dict>): The snapshot, to be given to restore.
+        """
+        return self._world.snapshot(), dict(self._loaded), dict(self._detached)
+
+    def restore(self, snapshot: Tuple[WorldSnapshot, dict, dict]):
+        """Restores the world and its chunks to a snapshot taken of this stream."""
+        world_snapshot, loaded, detached = snapshot
+        self._world.restore(world_snapshot)
+        self._loaded = dict(loaded)
+        self._detached = dict(detached)
+
+
+def iter_level(filename: str) -> Iterator[Tuple[str, int, int]]:
+    """Parse the entities within a level file, one line at a time.
+
+    Lines are read straight from the file, so the level is never held in memory as a
+    whole. Trailing whitespace is ignored, as is any space within a line.
 
     Parameters:
-        level (str): The level string.
+        filename (str): The name of the level file to parse.
+
+    Yields:
+        (tuple<str, int, int>): The (entity id, x, y) of each entity in the level.
+    """
+    with open(filename, 'r') as file:
+        for y, line in enumerate(file):
+            for x, character in enumerate(line.rstrip()):
+                if character != ' ':
+                    yield character, x, y
+
+
+# Suffix of the file, stored next to a level file, which contains the compiled level
+COMPILED_LEVEL_SUFFIX = ".lvlc"
+
+# Header of a compiled level file: magic, format version, sha256 of the level file & entity count
+COMPILED_LEVEL_HEADER = struct.Struct("<4sB32sI")
+COMPILED_LEVEL_MAGIC = b"LVLC"
+COMPILED_LEVEL_VERSION = 1
+
+# Compiled levels which have already been loaded, by the sha256 of their level file
+_compiled_levels = {}
+# Guards compiling levels, which may happen on several threads
+_compile_lock = threading.Lock()
+
+
+def parse_level(filename: str) -> List[Tuple[str, int, int]]:
+    """Parse the entities within a level file.
+
+    Parameters:
+        filename (str): The name of the level file to parse.
 
     Returns:
-        (tuple<int, int>): rows, columns dimensions of the given level.
+        (list<tuple<str, int, int>>): The (entity id, x, y) of each entity in the level.
     """
-    return level.count('\n') + 1, level.find('\n')
+    return list(iter_level(filename))
 
 
-def load_level(filename: str) -> str:
-    """Load a level file into a string and returns that string.
+def _write_compiled_level(filename: str, digest: bytes, entities: List[Tuple[str, int, int]]):
+    """Write a compiled level file of the given entities.
+
+    Entities are stored as three little-endian arrays of unsigned ints: the code points
+    of the entity ids, the x coordinates and the y coordinates.
+    """
+    columns = [array('I', (ord(entity_id) for entity_id, _, _ in entities)),
+               array('I', (x for _, x, _ in entities)),
+               array('I', (y for _, _, y in entities))]
+    if sys.byteorder != 'little':
+        for column in columns:
+            column.byteswap()
+
+    with open(filename, 'wb') as file:
+        file.write(COMPILED_LEVEL_HEADER.pack(COMPILED_LEVEL_MAGIC, COMPILED_LEVEL_VERSION,
+                                              digest, len(entities)))
+        for column in columns:
+            column.tofile(file)
 
-    Pads the string so that each line has the same amount of characters.
+
+def _read_compiled_level(filename: str, digest: bytes) -> List[Tuple[str, int, int]]:
+    """Read a compiled level file (see _write_compiled_level).
+
+    Returns:
+        (list<tuple<str, int, int>>): The entities of the level, or None if the file does not
+                                      exist or was not compiled from a level with the given digest.
+    """
+    try:
+        with open(filename, 'rb') as file:
+            header = file.read(COMPILED_LEVEL_HEADER.size)
+            if len(header) != COMPILED_LEVEL_HEADER.size:
+                return None
+
+            magic, version, level_digest, count = COMPILED_LEVEL_HEADER.unpack(header)
+            if (magic, version, level_digest) != (COMPILED_LEVEL_MAGIC, COMPILED_LEVEL_VERSION, digest):
+                return None
+
+            columns = []
+            for _ in range(3):
+                column = array('I')
+                column.fromfile(file, count)
+                if sys.byteorder != 'little':
+                    column.byteswap()
+                columns.append(column)
+    except (OSError, EOFError):
+        return None
+
+    ids, xs, ys = columns
+    return list(zip(map(chr, ids), xs, ys))
+
+
+def load_compiled_level(filename: str) -> List[Tuple[str, int, int]]:
+    """Load the entities within a level file, using its compiled level if it is fresh.
+
+    The compiled level is keyed by the sha256 of the level file, and is stored next to the
+    level file with the COMPILED_LEVEL_SUFFIX. If it is missing or stale, the level file is
+    parsed and compiled again. Levels which have already been loaded are kept in memory, so
+    loading them again does not parse or read any compiled level.
 
     Parameters:
         filename (str): The name of the level file to load.
 
     Returns:
-        (str): The level string resulting from loading a level file.
+        (list<tuple<str, int, int>>): The (entity id, x, y) of each entity in the level.
     """
-    with open(filename, 'r') as file:
-        file_contents = file.readlines()
+    with open(filename, 'rb') as file:
+        digest = hashlib.sha256(file.read()).digest()
 
-    # get the length of the longest line
-    max_width = len(max(file_contents))
+    with _compile_lock:
+        if digest in _compiled_levels:
+            return _compiled_levels[digest]
 
-    level = []
-    for line in file_contents:
-        # find how many characters are missing from the current line
-        fill = max_width - len(line)
-        # pad the current line
-        level.append(line.rstrip() + (" " * fill))
+        compiled_filename = filename + COMPILED_LEVEL_SUFFIX
+        entities = _read_compiled_level(compiled_filename, digest)
+        if entities is None:
+            entities = parse_level(filename)
+            try:
+                _write_compiled_level(compiled_filename, digest, entities)
+            except OSError:
+                # the cache is an optimisation, so levels in read-only locations still load
+                pass
 
-    return "\n".join(level)
+        _compiled_levels[digest] = entities
+        return entities
 
 
 def load_world(builder: WorldBuilder, filename: str, *args):
@@ -182,12 +510,27 @@ def load_world(builder: WorldBuilder, filename: str, *args):
     Returns:
         (World): The world produced by adding the found entities.
     """
-    level = load_level(filename)
-    for y, line in enumerate(level.split('\n')):
-        for x, character in enumerate(line):
-            if character in ('\n', ' '):
-                continue
-
-            builder.add_entity(character, x, y, *args)
+    for character, x, y in load_compiled_level(filename):
+        builder.add_entity(character, x, y, *args)
 
     return builder.build()
+
+
+def load_world_stream(builder: WorldBuilder, filename: str, chunk_columns: int,
+                      radius: float, *args) -> LevelStream:
+    """Loads entities within a file into a world builder, to be streamed into a world.
+
+    Parameters:
+        builder (WorldBuilder): The builder to append found entities to.
+        filename (str): The game world file to load with blocks.
+        chunk_columns (int): The number of grid columns in each chunk of the stream.
+        radius (float): The distance from the focus of the stream within which chunks
+                        are loaded.
+
+    Returns:
+        (LevelStream): The stream of the found entities, with no chunks loaded.
+    """
+    for character, x, y in load_compiled_level(filename):
+        builder.add_entity(character, x, y, *args)
+
+    return builder.build_stream(chunk_columns, radius)
@@ -3,7 +3,6 @@
 __version__ = "1.1.0"
 
 from game.entity import DynamicEntity
-import time
 
 
 class Player(DynamicEntity):
@@ -23,16 +22,11 @@ class Player(DynamicEntity):
         self._name = name
         self._score = 0
         self._invinc = False 
-        self._star_collected_time = time.time()
-        self._switch_time = time.time()
         self._on_tunnel = False 
         self._on_flag = False 
         self._proceed = False 
         self._next_level = None
         self._switch_status = True 
-        self._brick_list = []   
-        self._brick_pos_x= [] 
-        self._brick_pos_y = []
         self._mass = int(300)
         self._max_velocity = 100
 
@@ -74,14 +68,6 @@ class Player(DynamicEntity):
         ''' change the player's invincibility status ''' 
         self._invinc = change
 
-    def star_power(self): 
-        ''' sets the time when a star is collected.''' 
-        self._star_collected_time = time.time()
-
-    def get_star_time(self): 
-        ''' (time<float>): gets the time when player collected the star. ''' 
-        return self._star_collected_time
-
     def on_tunnel(self): 
         '''(bool): returns player tunnel status. '''
         return self._on_tunnel 
@@ -114,14 +100,6 @@ class Player(DynamicEntity):
         ''' (str) Gets next level of player ''' 
         return self._next_level
 
-    def switch_pressed_time(self): 
-        '''Sets the time when switch is pressed. ''' 
-        self._switch_time = time.time()
-
-    def get_switch_time(self):
-        ''' (time <float>): Gets the time when switch is pressed ''' 
-        return self._switch_time
-
     def switch_status(self):
         ''' (bool): gets the status of the Switch being pressed or not. '''
         return self._switch_status
@@ -130,21 +108,5 @@ class Player(DynamicEntity):
         ''' sets to False if switch is being pressed. '''
         self._switch_status = change
 
-    def set_brick_pos_x (self, brick_posx): 
-        ''' (list<tuple>): sets the x coordinates of the bricks removed. ''' 
-        self._brick_pos_x.append(brick_posx) 
-
-    def set_brick_pos_y (self, brick_posy): 
-        ''' (list<tuple>): sets the y coordinates of the bricks removed. ''' 
-        self._brick_pos_y.append(brick_posy) 
-
-    def get_brick_pos_x(self): 
-        ''' returns (list<tuple>) of x coordinates of the bricks removed. '''
-        return self._brick_pos_x
-
-    def get_brick_pos_y(self): 
-        ''' returns (list<tuple>) of  y coordinates of the bricks removed. '''
-        return self._brick_pos_y
-
     def __repr__(self):
         return f"Player({self._name!r})"
@@ -0,0 +1,798 @@
+"""
+Headless game logic for Mario, a 2d platformer.
+
+A GameSession owns the world, player and level transitions of a game, and is driven
+by an explicit action API, such that it can be run without a display.
+"""
+
+__author__ = "Juan Espares: 44317962" 
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Set, Tuple
+
+import pymunk
+
+from game.block import Block, MysteryBlock
+from game.clock import Clock, RealClock
+from game.entity import Entity
+from game.mob import Mob, CloudMob, Fireball
+from game.item import DroppedItem, Coin
+from game.world import World, WorldSnapshot
+from game.util import get_arbiter_direction
+
+from level import load_world, load_world_stream, LevelStream, WorldBuilder
+from player import Player
+
+BLOCK_SIZE = 2 ** 4
+
+# Distance from the player beyond which entities are not stepped
+ACTIVE_RADIUS = 1080
+
+# Time (in seconds) for which bricks removed by a switch stay removed
+SWITCH_DURATION = 3
+
+# Time (in seconds) for which a star makes the player invincible
+STAR_DURATION = 10
+
+# Headings of a config file which do not describe a level
+CONFIG_SETTINGS = {'World', 'Player'}
+
+# Name used by a config file for the absence of a next level
+CONFIG_END = 'END'
+
+# Settings of a level in a config file which give the next level of each goal block
+GOAL_SETTINGS = {
+    "tunnel": "tunnel ",
+    "flag": "goal "
+}
+
+GOAL_SIZES = {
+    "flag": (0.2, 9),
+    "tunnel": (2, 2)
+}
+
+BLOCKS = {
+    '#': 'brick',
+    '%': 'brick_base',
+    '?': 'mystery_empty',
+    '$': 'mystery_coin',
+    '^': 'cube', 
+    'b': 'bounce_block' , 
+    'I': 'flag' , 
+    '=': 'tunnel' , 
+    'S': 'switch'
+
+}
+
+ITEMS = {
+    'C': 'coin' , 
+    '*': 'star'
+}
+
+MOBS = {
+    '&': "cloud", 
+    '@': "mushroom"
+}
+
+
+class Switch(Block): 
+    ''' A switch block that causes all bricks nearby to disappear. ''' 
+
+    _id = 'switch'
+
+    def __init__(self): 
+        super().__init__() 
+        self._active = True 
+
+    def on_hit(self, event: pymunk.Arbiter, data):
+        ''' 
+         When switch is hit from the top, remove all bricks in a set radius. 
+
+        '''
+        world,player = data
+
+        #Top of block is being hit in order to activate. 
+        if get_arbiter_direction(event, player, self) != 'A': 
+            return 
+
+        if self._active:
+            player.set_switch_status(False)
+            x, y = self.get_position()
+
+            brick_remove= world.get_blocks_in_radius(x, y, 65, 'brick')
+            
+            for b in brick_remove: 
+                world.remove_block(b)
+                        
+            self._active = False
+            world.mark_changed(self)
+            world.schedule(SWITCH_DURATION, partial(self._restore, world, player, brick_remove))
+
+    def _restore(self, world: World, player: Player, bricks): 
+        ''' Adds back the bricks removed when the switch was pressed, and reactivates it. ''' 
+        world.add_shapes(b.get_shape() for b in bricks)
+        player.set_switch_status(True)
+        self._active = True 
+        world.mark_changed(self)
+            
+    def is_active(self) -> bool: 
+        '''(bool) returns true if switch is not yet pressed. '''
+        return self._active
+
+def create_unknown(world: World, entity_id: str, x: int, y: int, *args):
+    """Create an unknown entity."""
+    world.add_thing(Entity(), x * BLOCK_SIZE, y * BLOCK_SIZE,
+                    size=(BLOCK_SIZE, BLOCK_SIZE))
+
+
+class Mushroom(Mob): 
+    ''' Mushroom is a moving entity that damages player ''' 
+    _id = 'mushroom'
+
+    def __init__(self):
+        ''' Constructs a mushroom mob. ''' 
+        super().__init__(self._id, size=(20,25), tempo=40)
+
+    def on_hit(self, event, data): 
+        ''' What happens to the mushroom when it collides with entity. '''
+        world, player = data  
+
+        direction = get_arbiter_direction(event, player, self)
+
+        #Player kills Mushroom if player lands on top. 
+        if direction == 'A': 
+            player.set_velocity((0,-150))
+            world.remove_mob(self)
+
+        elif direction == 'L': 
+            player.change_health(-1)
+            player.set_velocity((-80,0))
+
+        elif direction == 'R':  
+            player.change_health(-1)
+            player.set_velocity((80,0))
+
+        
+class Star(DroppedItem): 
+    ''' A star item that grants invincibility for 10 seconds. Player takes no damage 
+    and kills any mob that it collides with. ''' 
+
+    _id = 'star'
+
+    def __init__(self): 
+        super().__init__()
+
+    def collect(self, player: Player): 
+        '''Grants player special powers -> Invincibility. 
+        Parameters (Player): The player who obtained the star. 
+        '''  
+        player.set_invinc(True)
+
+
+class BounceBlock(Block): 
+    ''' 
+        A bounce block which propels the player into the air when they jump on top of the 
+    block. 
+    ''' 
+    _id = 'bounce_block'
+
+    def __init__(self): 
+        ''' Constructs a bounce block. 
+        '''
+        super().__init__()  
+        self._active = True
+
+    def on_hit(self, event:pymunk.Arbiter, data): 
+        ''' callback collision with player event handler.  '''
+        world, player = data
+        if get_arbiter_direction(event, player, self) == 'A': 
+            player.set_velocity((0,-300))
+            
+class Tunnel(Block): 
+    """ A goal that allows a player to change and progress between levels.""" 
+
+    _id = 'tunnel' 
+    _cell_size = (2,2)
+
+    def __init__(self, next_level: str = None): 
+        super().__init__()
+        self._id = 'tunnel'
+        self._next_level = next_level 
+
+    def on_hit(self, event:pymunk.Arbiter, data): 
+        world, player = data 
+
+        if get_arbiter_direction(event, player, self) == 'A': 
+            player.set_on_tunnel(True)
+            player.next_level(self._next_level)
+
+        else: 
+            pass 
+        
+class Flag(Block): 
+    ''' Flag that allows player to progress to next level. ''' 
+
+    _id = 'flag'
+    _cell_size = (0.2 , 9)
+
+    def __init__(self, next_level: str = None): 
+        super().__init__()
+        self._id = 'flag'
+        self._next_level = next_level    
+
+    def on_hit(self, event:pymunk.Arbiter, data): 
+        world, player = data 
+
+        if get_arbiter_direction(event, player, self) == 'A': 
+            
+            player.change_health(3)
+            player.set_on_flag(True)
+
+        else: 
+            player.next_level(self._next_level)
+            player.set_proceed(True)
+
+
+# Constructors of each block, item & mob id; blocks without one are plain blocks
+BLOCK_FACTORIES = {
+    "mystery_empty": MysteryBlock,
+    "mystery_coin": partial(MysteryBlock, drop="coin", drop_range=(3, 6)),
+    "bounce_block": BounceBlock,
+    "tunnel": Tunnel,
+    "flag": Flag,
+    "switch": Switch
+}
+
+ITEM_FACTORIES = {
+    "coin": Coin,
+    "star": Star
+}
+
+MOB_FACTORIES = {
+    "cloud": CloudMob,
+    "fireball": Fireball,
+    "mushroom": Mushroom
+}
+
+
+def read_config(filename): 
+
+    ''' Config parser that reads a .txt file that stores information and  can be 
+    accessed by the game. 
+    Parameters:
+            (str<.txt>): txt file that user wishes to load. 
+    Return: 
+            (dictionary): nested dictionary containing game information. 
+    Raises: 
+            ValueError: If the file is not a valid config file. 
+
+    ''' 
+
+    config ={}
+    heading = None 
+    with open(filename) as fin: 
+        for line in fin: 
+            line = line.strip() 
+            if line.startswith('==') and line.endswith('=='): 
+                heading = line[2:-2]
+                config[heading] = {}
+            elif line.count(':') <= 1 and heading is not None:
+                attr, _,value = line.partition(':')
+                config[heading][attr] = value
+            else: 
+                raise ValueError('Invalid config file') 
+
+
+    def remove_empty(orig): 
+
+        ''' Function that deletes null keys and values within 
+        the nested dictionary. 
+        Parameters:
+                (dictionary): nested dictionary generated from txt file. 
+
+        Return: 
+                (dictionary): nested dictionary with keys and values containing '' value removed. 
+
+        '''
+        clean_dict = {} 
+        for a, b in orig.items():
+            if isinstance(b, dict):
+                b = remove_empty(b)
+            if b != '':
+                clean_dict[a]=b
+        return clean_dict
+
+    return remove_empty(config)
+
+
+def get_info(config, setting): 
+    '''    Gets the information (value) from config file 
+    Parameters: 
+            (dictionary): config file parsed and readable. 
+            (str): Key of config file dictionary -> {tag.key of inner dictionary} 
+    Return:
+            (attribute): value of inner dictionary of config 
+    ''' 
+    heading, attr = setting.split('.')
+    return config[heading][attr]
+
+
+def get_level_graph(config) -> Dict[str, Set[str]]: 
+    '''    Gets the levels which can be reached from each level in a config file 
+    Parameters: 
+            (dictionary): config file parsed and readable. 
+    Return:
+            (dictionary): the filenames of the levels reachable through the goals 
+                          (i.e. tunnel, goal) of each level, by level filename. 
+    ''' 
+    graph = {}
+    for heading, settings in config.items(): 
+        if heading in CONFIG_SETTINGS: 
+            continue
+        graph[heading] = {value.strip() for value in settings.values()
+                          if value.strip() != CONFIG_END}
+    return graph
+
+
+class GameSession:
+    """A game of Mario without any user interface.
+
+    The session is advanced by calling step with the time elapsed since the last step,
+    and the player is controlled through the move, jump and duck methods, or by
+    performing one of the named ACTIONS.
+    """
+
+    # Names of the actions a player can perform
+    ACTIONS = ('left', 'right', 'jump', 'duck')
+
+    _world: World
+
+    def __init__(self, level: str = 'level1.txt', player: Player = None,
+                 clock: Clock = None, seed=None, prefetch: bool = True,
+                 chunk_columns: int = None, spatial_hash: bool = False):
+        """Construct a new game session and load its first level.
+
+        A session with a SimulatedClock and a seed is deterministic, i.e. it produces
+        the same results for the same sequence of steps and actions.
+
+        Parameters:
+            level (str): The level file to load, and to return to when reset.
+            player (Player): The player of the game, defaults to a new player.
+            clock (Clock): The source of time for the game, defaults to a RealClock.
+            seed (int): The seed of the game's random number generator, or None to
+                        use the shared random module.
+            prefetch (bool): If True, the levels reachable from the loaded level (as
+                             given by the config) are built on a worker thread.
+            chunk_columns (int): If given, levels are streamed into their world in chunks
+                                 of this many columns around the player (see LevelStream),
+                                 rather than being built in full.
+            spatial_hash (bool): If True, levels use a spatial hash broadphase rather than
+                                 a bounding box tree (see World.use_spatial_hash).
+        """
+        if clock is None:
+            clock = RealClock()
+        self._clock = clock
+
+        self._rng = None if seed is None else random.Random(seed)
+
+        # Levels being built in the background, by level filename
+        self._prefetched = {}
+        self._executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+
+        self._chunk_columns = chunk_columns
+        self._spatial_hash = spatial_hash
+        # Stream of the loaded level, or None if it was built in full
+        self._stream = None
+
+        self._config = {}
+        self._level_graph = {}
+        self._current_level = level
+        self._level = None
+        # State of the loaded level before the player was added, used to reset it
+        self._initial_snapshot = None
+        # Time at which the player's star power ends, or None if it is not active, and
+        # the callback scheduled in the current world to end it
+        self._star_expiry = None
+        self._star_timer = None
+        self._playerPosx = int(30)
+        self._playerPosy = int(30)
+
+        if player is None:
+            player = Player(max_health= 5)
+        self._player = player
+        self.load_level(self._current_level)
+
+    def get_world(self) -> World:
+        """(World): Returns the world of the current level."""
+        return self._world
+
+    def get_player(self) -> Player:
+        """(Player): Returns the player of the game."""
+        return self._player
+
+    def get_clock(self) -> Clock:
+        """(Clock): Returns the source of time for the game."""
+        return self._clock
+
+    def get_level(self) -> str:
+        """(str): Returns the filename of the currently loaded level."""
+        return self._level
+
+    def configure(self, config): 
+        ''' Applies the settings of a parsed config file (see read_config) to the game, 
+        loading its starting level. 
+        Parameters: 
+                (dictionary): nested dictionary of config file. 
+        ''' 
+        self._config = config
+        self._level_graph = get_level_graph(config)
+        gravity = get_info(config, 'World.gravity ')
+        self._world.set_gravity(0,int(gravity))
+        start = get_info(config,'World.start ')
+        start1 = start[1:]
+        self.load_level(start1)
+        
+        charr = get_info(config, 'Player.character ')
+        charr1 = charr[1:]
+        self._player.set_name(charr1)
+
+        x_cor = get_info(config, 'Player.x ')
+        self._playerPosx = int(x_cor) 
+
+        y_cor = get_info(config, 'Player.y ')
+        self._playerPosy = int(y_cor)
+
+        playr_mass = get_info(config, 'Player.mass ')
+        self._player.set_mass(playr_mass)
+
+        playr_health = get_info(config, 'Player.health ')
+        self._player._max_health = int(playr_health)
+        self._player.change_health(int(playr_health))
+        
+        max_x = get_info(config, 'Player.max_velocity ')
+        self._player._max_velocity = int(max_x)
+
+    def _create_builder(self, level: str) -> WorldBuilder:
+        """(WorldBuilder): Returns a new builder for the world of a level of this game.
+
+        The goal blocks of the level lead to the levels given for them by the config,
+        or nowhere if the config gives no level that exists.
+        """
+        world_builder = WorldBuilder(BLOCK_SIZE, gravity=(0, 300), fallback=create_unknown,
+                                     merge_blocks=True, clock=self._clock, rng=self._rng,
+                                     spatial_hash=self._spatial_hash)
+        for entity_id, block_id in BLOCKS.items():
+            factory = BLOCK_FACTORIES.get(block_id)
+            if factory is None:
+                world_builder.register_plain_block(entity_id, block_id)
+            else:
+                world_builder.register_factory(entity_id, factory, World.add_block)
+
+        for entity_id, item_id in ITEMS.items():
+            factory = ITEM_FACTORIES.get(item_id, partial(DroppedItem, item_id))
+            world_builder.register_factory(entity_id, factory, World.add_item)
+
+        for entity_id, mob_id in MOBS.items():
+            factory = MOB_FACTORIES.get(mob_id, partial(Mob, mob_id, size=(1, 1)))
+            world_builder.register_factory(entity_id, factory, World.add_mob)
+
+        settings = self._config.get(level, {})
+        for entity_id, block_id in BLOCKS.items():
+            if block_id in GOAL_SETTINGS:
+                next_level = settings.get(GOAL_SETTINGS[block_id], CONFIG_END).strip()
+                if next_level == CONFIG_END or not os.path.exists(next_level):
+                    next_level = None
+                world_builder.set_parameters(entity_id, next_level=next_level)
+
+        return world_builder
+
+    def _build_level(self, level: str) -> Tuple[World, LevelStream, WorldSnapshot]:
+        """Builds the world of a level, without the player.
+
+        Uses its own builder, such that it can be called from a worker thread. If levels
+        are streamed, only the chunks around the player's starting position are loaded.
+
+        Returns:
+            (tuple<World, LevelStream, WorldSnapshot>): The world, its stream (or None if
+                it was built in full) and a snapshot of its initial state (a stream
+                snapshot if it is streamed).
+        """
+        if self._chunk_columns is None:
+            world = load_world(self._create_builder(level), level)
+            world.set_active_radius(ACTIVE_RADIUS)
+            return world, None, world.snapshot()
+
+        stream = load_world_stream(self._create_builder(level), level, self._chunk_columns,
+                                   ACTIVE_RADIUS)
+        world = stream.get_world()
+        world.set_active_radius(ACTIVE_RADIUS)
+        stream.update(self._playerPosx)
+        return world, stream, stream.snapshot()
+
+    def _prefetch_levels(self):
+        """Starts building the levels reachable from the loaded level in the background,
+        and discards any other levels that were built in the background.
+        """
+        if self._executor is None:
+            return
+
+        reachable = self._level_graph.get(self._level, set())
+        for level in list(self._prefetched):
+            if level not in reachable:
+                self._prefetched.pop(level).cancel()
+
+        for level in reachable:
+            if level not in self._prefetched and os.path.exists(level):
+                self._prefetched[level] = self._executor.submit(self._build_level, level)
+
+    def load_level(self, new_level):
+        ''' Builds a new world from a level file and places the player within it. 
+        If the level has been built in the background, that world is used instead. ''' 
+        future = self._prefetched.pop(new_level, None)
+        if future is not None and not future.cancelled(): 
+            world, stream, snapshot = future.result()
+        else: 
+            world, stream, snapshot = self._build_level(new_level)
+
+        self._world = world
+        self._stream = stream
+        self._initial_snapshot = snapshot
+        self._world.add_player(self._player, self._playerPosx, self._playerPosy) 
+        self._level = new_level
+        # Pending switch restorations are left behind with the previous world
+        self._player.set_switch_status(True)
+        self._schedule_star_expiry()
+
+        self._setup_collision_handlers()
+        self._prefetch_levels()
+
+    def _start_star_power(self): 
+        ''' Makes the player invincible for STAR_DURATION seconds from now. ''' 
+        self._player.set_invinc(True)
+        self._star_expiry = self._clock.time() + STAR_DURATION
+        self._schedule_star_expiry()
+
+    def _schedule_star_expiry(self): 
+        ''' Schedules the end of the player's star power in the current world, replacing 
+        any callback previously scheduled to end it. ''' 
+        if self._star_timer is not None: 
+            self._world.cancel(self._star_timer)
+            self._star_timer = None
+        if self._star_expiry is not None: 
+            self._star_timer = self._world.schedule(self._star_expiry - self._clock.time(),
+                                                    self._end_star_power)
+
+    def _end_star_power(self): 
+        ''' Ends the player's invincibility. ''' 
+        if self._star_timer is not None: 
+            self._world.cancel(self._star_timer)
+        self._star_expiry = self._star_timer = None
+        self._player.set_invinc(False)
+
+    def close(self): 
+        ''' Stops building levels in the background. ''' 
+        if self._executor is not None: 
+            self._executor.shutdown(wait=False)
+
+    def restart_level(self): 
+        ''' Restores the loaded level to its state when it was loaded and places the 
+        player at the start, without rebuilding the level. ''' 
+        if self._stream is not None: 
+            self._stream.restore(self._initial_snapshot)
+        else: 
+            self._world.restore(self._initial_snapshot)
+        # Pending switch restorations are discarded along with the restored world
+        self._player.set_switch_status(True)
+        self._world.add_player(self._player, self._playerPosx, self._playerPosy) 
+        self._schedule_star_expiry()
+
+    def reset_level(self): 
+        ''' resets game to level 1 ''' 
+        
+        self._player.change_score(-(self._player.get_score()))
+        maxhealth = self._player.get_max_health() 
+        self._player.change_health(maxhealth)
+        self._end_star_power()
+        if self._level == self._current_level: 
+            self.restart_level()
+        else: 
+            self.load_level(self._current_level)
+
+    def perform(self, action: str):
+        """Performs one of the named ACTIONS for the player.
+
+        Parameters:
+            action (str): The name of the action to perform.
+        """
+        x_speed = self._player._max_velocity
+        if action == 'left':
+            self.move(-(x_speed), 0)
+        elif action == 'right':
+            self.move(x_speed, 0)
+        elif action == 'jump':
+            self.jump()
+        elif action == 'duck':
+            self.duck()
+        else:
+            raise ValueError(f"Unknown action {action!r}")
+
+    def step(self, elapsed: float):
+        """Advances the game by an amount of elapsed time.
+
+        Parameters:
+            elapsed (float): The time (in seconds) since the last step.
+        """
+        if self._stream is not None:
+            self._stream.update(self._player.get_position()[0])
+
+        data = (self._world, self._player)
+        self._world.update(elapsed, data, focus=self._player.get_position())
+
+
+        #Flagpole next level 
+        if self._player.get_proceed() == True: 
+            self._player.set_proceed(False)
+            if self._player.get_next_level() is not None: 
+                self.load_level(self._player.get_next_level())
+
+    def move(self, dx, dy):
+        '''Moves player left or right 
+            Parameters: 
+                dx, dy <int> : the velocity of player moving. 
+        ''' 
+        plyr_velocity = tuple((dx,dy))
+        self._player.set_velocity(plyr_velocity)
+        
+       
+    def jump(self):
+        ''' Makes player jump. ''' 
+        jump_check = self._player.is_jumping() 
+        if jump_check == False: 
+            velocity_current = self._player.get_velocity()
+            velocity_current_list = list(velocity_current) 
+            velocity_current_list[1] -= 150
+            velocity_current = tuple(velocity_current_list)
+            self._player.set_velocity(velocity_current)
+            self._player.set_jumping(True)
+        else: 
+            self._player.set_jumping(False) 
+             
+    def duck(self):    
+        '''  Makes player crouch.
+        '''  
+        velocity_current = self._player.get_velocity()
+        velocity_current_list = list(velocity_current) 
+        velocity_current_list[1] += 160
+        velocity_current = tuple(velocity_current_list)
+        self._player.set_velocity(velocity_current)
+        self._player.set_jumping(False)
+
+        #Proceeds to next level when crouching on Tunnel
+        if self._player.on_tunnel() == True and self._player.get_next_level() is not None: 
+            self.load_level(self._player.get_next_level())
+
+    def _setup_collision_handlers(self):
+        self._world.add_collision_handler("player", "item", on_begin=self._handle_player_collide_item)
+
+        dispatch = self._world.add_collision_dispatch
+        dispatch("player", None, "block", None, on_begin=self._handle_player_collide_block)
+        dispatch("player", None, "block", "switch", on_begin=self._handle_player_collide_switch)
+        dispatch("player", None, "block", "tunnel", on_separate=self._handle_player_separate_tunnel)
+        dispatch("player", None, "block", "flag", on_separate=self._handle_player_separate_flag)
+
+        self._world.add_collision_handler("player", "mob", on_begin=self._handle_player_collide_mob)
+
+        dispatch("mob", "fireball", "block", None, on_begin=self._handle_fireball_collide_block)
+        dispatch("mob", "fireball", "block", "brick", on_begin=self._handle_fireball_collide_brick)
+        dispatch("mob", "mushroom", "block", None, on_begin=self._handle_mushroom_collide_block)
+
+        # Fireballs take precedence over mushrooms when they collide
+        dispatch("mob", None, "mob", None, on_begin=self._handle_mob_collide_mob)
+        dispatch("mob", "fireball", "mob", None, on_begin=self._handle_fireball_collide_mob)
+        dispatch("mob", None, "mob", "fireball", on_begin=self._handle_fireball_collide_mob)
+        dispatch("mob", "mushroom", "mob", None, on_begin=self._handle_mushroom_collide_mob)
+        dispatch("mob", None, "mob", "mushroom", on_begin=self._handle_mushroom_collide_mob)
+        dispatch("mob", "mushroom", "mob", "fireball", on_begin=self._handle_fireball_collide_mob)
+
+        # Mobs and items pass through each other
+        self._world.ignore_collisions("mob", "item")
+
+    def _handle_fireball_collide_block(self, mob: Mob, block: Block, data,
+                                       arbiter: pymunk.Arbiter) -> bool:
+        self._world.remove_mob(mob)
+        return True 
+
+    def _handle_fireball_collide_brick(self, mob: Mob, block: Block, data,
+                                       arbiter: pymunk.Arbiter) -> bool:
+        self._world.remove_block(block)
+        self._world.remove_mob(mob)
+        return True 
+
+    def _handle_mushroom_collide_block(self, mob: Mob, block: Block, data,
+                                       arbiter: pymunk.Arbiter) -> bool:
+        direction = get_arbiter_direction(arbiter, mob, block)
+        if direction == 'L':
+            mob.set_tempo(-40)
+            
+        elif direction == 'R': 
+            mob.set_tempo(40)
+        return True 
+
+    def _handle_mob_collide_mob(self, mob1: Mob, mob2: Mob, data,
+                                arbiter: pymunk.Arbiter) -> bool:
+        return False
+
+    def _handle_fireball_collide_mob(self, mob1: Mob, mob2: Mob, data,
+                                     arbiter: pymunk.Arbiter) -> bool:
+        self._world.remove_mob(mob1)
+        self._world.remove_mob(mob2)
+        return False
+
+    def _handle_mushroom_collide_mob(self, mob1: Mob, mob2: Mob, data,
+                                     arbiter: pymunk.Arbiter) -> bool:
+        mob1.set_tempo(-mob1.get_tempo())
+        mob2.set_tempo(-mob2.get_tempo())
+        return False
+
+
+    def _handle_player_collide_item(self, player: Player, dropped_item: DroppedItem,
+                                    data, arbiter: pymunk.Arbiter) -> bool:
+        """Callback to handle collision between the player and a (dropped) item. If the player has sufficient space in
+        their to pick up the item, the item will be removed from the game world.
+
+        Parameters:
+            player (Player): The player that was involved in the collision
+            dropped_item (DroppedItem): The (dropped) item that the player collided with
+            data (dict): data that was added with this collision handler (see data parameter in
+                         World.add_collision_handler)
+            arbiter (pymunk.Arbiter): Data about a collision
+                                      (see http://www.pymunk.org/en/latest/pymunk.html#pymunk.Arbiter)
+                                      NOTE: you probably won't need this
+        Return:
+             bool: False (always ignore this type of collision)
+                   (more generally, collision callbacks return True iff the collision should be considered valid; i.e.
+                   returning False makes the world ignore the collision)
+        """
+
+        dropped_item.collect(self._player)
+        if isinstance(dropped_item, Star): 
+            self._start_star_power()
+        self._world.remove_item(dropped_item)
+        return False
+
+    def _handle_player_collide_block(self, player: Player, block: Block, data,
+                                     arbiter: pymunk.Arbiter) -> bool:
+        block.on_hit(arbiter, (self._world, player)  )
+        return True  
+
+    def _handle_player_collide_switch(self, player: Player, block: Block, data,
+                                      arbiter: pymunk.Arbiter) -> bool:
+        if self._player.switch_status() == False: 
+            return False 
+        return self._handle_player_collide_block(player, block, data, arbiter)
+
+    def _handle_player_collide_mob(self, player: Player, mob: Mob, data,
+                                   arbiter: pymunk.Arbiter) -> bool:
+
+        if self._player.get_invinc() == True: 
+            self._world.remove_mob(mob)
+            return False 
+
+        else: 
+            mob.on_hit(arbiter, (self._world, player))  
+            return True 
+
+    def _handle_player_separate_tunnel(self, player: Player, block: Block, data,
+                                       arbiter: pymunk.Arbiter) -> bool:
+        player.set_on_tunnel(False)
+        return True
+
+    def _handle_player_separate_flag(self, player: Player, block: Block, data,
+                                     arbiter: pymunk.Arbiter) -> bool:
+        player.set_on_flag(False)
+        return True